@@ -0,0 +1,53 @@
+"""add task listing indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_assigned_to_status_id',
+            'tasks',
+            ['assigned_to', 'status', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_assigned_by_status_id',
+            'tasks',
+            ['assigned_by', 'status', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_role_id',
+            'users',
+            ['role', 'id'],
+            unique=False,
+            postgresql_where=sa.text("role = 'worker'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_role_id', table_name='users')
+    op.drop_index('ix_tasks_assigned_by_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_status_id', table_name='tasks')
@@ -0,0 +1,53 @@
+"""add task changes indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:02:17.224861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_assigned_to_changed_at_id',
+            'tasks',
+            ['assigned_to', sa.text('coalesce(updated_at, created_at)'), 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_assigned_by_changed_at_id',
+            'tasks',
+            ['assigned_by', sa.text('coalesce(updated_at, created_at)'), 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_assigned_by_changed_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_assigned_to_changed_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,112 @@
+"""add task status counts
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 18:21:05.617342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_status_counts',
+        sa.Column('assigned_by', sa.Integer(), nullable=False),
+        sa.Column('assigned_to', sa.Integer(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('pending', 'in_progress', 'completed', name='taskstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('assigned_by', 'assigned_to', 'status'),
+    )
+    op.create_index('ix_task_status_counts_assigned_to', 'task_status_counts', ['assigned_to'], unique=False)
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_status_counts_on_insert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO task_status_counts AS c (assigned_by, assigned_to, status, count)
+            SELECT assigned_by, assigned_to, status, count(*)
+            FROM new_rows
+            GROUP BY assigned_by, assigned_to, status
+            ORDER BY assigned_by, assigned_to, status
+            ON CONFLICT (assigned_by, assigned_to, status)
+            DO UPDATE SET count = c.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_status_counts_on_update() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO task_status_counts AS c (assigned_by, assigned_to, status, count)
+            SELECT assigned_by, assigned_to, status, sum(delta)
+            FROM (
+                SELECT assigned_by, assigned_to, status, -1 AS delta FROM old_rows
+                UNION ALL
+                SELECT assigned_by, assigned_to, status, 1 AS delta FROM new_rows
+            ) AS changes
+            GROUP BY assigned_by, assigned_to, status
+            HAVING sum(delta) <> 0
+            ORDER BY assigned_by, assigned_to, status
+            ON CONFLICT (assigned_by, assigned_to, status)
+            DO UPDATE SET count = c.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_status_counts_insert
+        AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_on_insert()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_status_counts_update
+        AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_on_update()
+        """
+    )
+
+    # backfill from the tasks already there
+    op.execute(
+        """
+        INSERT INTO task_status_counts (assigned_by, assigned_to, status, count)
+        SELECT assigned_by, assigned_to, status, count(*)
+        FROM tasks
+        GROUP BY assigned_by, assigned_to, status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS tasks_status_counts_update ON tasks')
+    op.execute('DROP TRIGGER IF EXISTS tasks_status_counts_insert ON tasks')
+    op.execute('DROP FUNCTION IF EXISTS task_status_counts_on_update()')
+    op.execute('DROP FUNCTION IF EXISTS task_status_counts_on_insert()')
+    op.drop_index('ix_task_status_counts_assigned_to', table_name='task_status_counts')
+    op.drop_table('task_status_counts')
@@ -0,0 +1,75 @@
+"""add archived tasks
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 19:02:37.184520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'archived_tasks',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column(
+            'status',
+            postgresql.ENUM('pending', 'in_progress', 'completed', name='taskstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('assigned_to', sa.Integer(), nullable=False),
+        sa.Column('assigned_by', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_archived_tasks_assigned_to_id', 'archived_tasks', ['assigned_to', 'id'], unique=False)
+    op.create_index('ix_archived_tasks_assigned_by_id', 'archived_tasks', ['assigned_by', 'id'], unique=False)
+    # the archiver's scan index is built without blocking task writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_completed_changed_at',
+            'tasks',
+            [sa.text('coalesce(updated_at, created_at)')],
+            unique=False,
+            postgresql_where=sa.text("status = 'completed'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # archived rows go back to the live table before the archive is dropped;
+    # the status counters still include them, so skip the insert trigger
+    op.execute('ALTER TABLE tasks DISABLE TRIGGER tasks_status_counts_insert')
+    op.execute(
+        """
+        INSERT INTO tasks (id, title, description, status, assigned_to, assigned_by,
+                           created_at, updated_at)
+        SELECT id, title, description, status, assigned_to, assigned_by,
+               created_at, updated_at
+        FROM archived_tasks
+        """
+    )
+    op.execute('ALTER TABLE tasks ENABLE TRIGGER tasks_status_counts_insert')
+    op.drop_index('ix_tasks_completed_changed_at', table_name='tasks')
+    op.drop_index('ix_archived_tasks_assigned_by_id', table_name='archived_tasks')
+    op.drop_index('ix_archived_tasks_assigned_to_id', table_name='archived_tasks')
+    op.drop_table('archived_tasks')
@@ -0,0 +1,51 @@
+"""add archived task search vector
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 10:12:41.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'archived_tasks',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            ),
+            nullable=True,
+        ),
+    )
+    # the archiver keeps inserting while the index is built
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_archived_tasks_search_vector',
+            'archived_tasks',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archived_tasks_search_vector', table_name='archived_tasks')
+    op.drop_column('archived_tasks', 'search_vector')
@@ -1,15 +1,28 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app import metrics
 from app.constant import (ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM,
-                          REFRESH_TOKEN_EXPIRE_DAYS, SECRET_KEY)
+                          PASSWORD_HASH_QUEUE_SIZE, PASSWORD_HASH_WORKERS,
+                          REFRESH_TOKEN_EXPIRE_DAYS, SECRET_KEY,
+                          STREAM_TICKET_EXPIRE_SECONDS)
 from app.schemas import TokenData
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+PASSWORD_HASH_TIME = metrics.histogram(
+    "password_hash_seconds", "Time spent in bcrypt, by operation", ("op",)
+)
+JWT_DECODE_FAILURES = metrics.counter(
+    "jwt_decode_failures_total", "Access tokens rejected by decode_access_token"
+)
+
 
 # ---------------- Password ----------------
 def hash_password(password: str) -> str:
@@ -20,6 +33,66 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# ---------------- Password Pool ----------------
+# bcrypt releases the GIL while hashing, so a small dedicated thread pool keeps
+# login storms off the event loop and off the shared request threadpool.
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password"
+)
+_password_jobs = 0  # running + queued, only touched from the event loop thread
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool queue is full."""
+
+
+def password_queue_depth() -> int:
+    return max(_password_jobs - PASSWORD_HASH_WORKERS, 0)
+
+
+metrics.callback(
+    "password_pool_queue_depth",
+    "Password jobs waiting for a free worker",
+    lambda: {(): password_queue_depth()},
+)
+
+
+def _timed(fn, op: str):
+    def run(*args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_TIME.observe(time.perf_counter() - start, (op,))
+
+    return run
+
+
+def _password_job_done(_future) -> None:
+    global _password_jobs
+    _password_jobs -= 1
+
+
+async def _run_password_job(fn, *args):
+    global _password_jobs
+    if _password_jobs >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE:
+        raise PasswordPoolBusy()
+    loop = asyncio.get_running_loop()
+    _password_jobs += 1
+    future = _password_executor.submit(fn, *args)
+    # Release the slot when the job really finishes, even if the request is gone
+    future.add_done_callback(lambda f: loop.call_soon_threadsafe(_password_job_done, f))
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_job(_timed(hash_password, "hash"), password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_password_job(_timed(verify_password, "verify"), plain, hashed)
+
+
 # ---------------- Token Create ----------------
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -39,26 +112,65 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Stream tickets carry the access token claims plus a "typ" that only the event
+# streams accept.
+STREAM_TICKET = "stream"
+
+
+def create_stream_ticket(data: dict) -> str:
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS)
+    to_encode.update({"typ": STREAM_TICKET, "exp": expire})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def token_claims(user) -> dict:
+    return {"user_id": user.id, "role": user.role.value, "ver": user.token_version}
+
+
 # ---------------- Token Decode ----------------
 def decode_access_token(token: str) -> TokenData:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("typ") == STREAM_TICKET:
+            raise JWTError("Stream ticket used as a token")
         user_id: int = payload.get("user_id")
         role: str = payload.get("role")
         if user_id is None or role is None:
             raise JWTError("Invalid token payload")
-        return TokenData(user_id=user_id, role=role)
+        return TokenData(
+            user_id=user_id, role=role, token_version=payload.get("ver", 0)
+        )
     except JWTError:
+        JWT_DECODE_FAILURES.inc()
         return TokenData(user_id=None, role=None)
 
 
 def decode_refresh_token(token: str) -> TokenData:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("typ") == STREAM_TICKET:
+            raise JWTError("Stream ticket used as a token")
         user_id: int = payload.get("user_id")
         role: str = payload.get("role")
         if user_id is None or role is None:
             raise JWTError("Invalid token payload")
-        return TokenData(user_id=user_id, role=role)
+        return TokenData(
+            user_id=user_id, role=role, token_version=payload.get("ver", 0)
+        )
+    except JWTError:
+        return TokenData(user_id=None, role=None)
+
+
+def decode_stream_ticket(token: str) -> TokenData:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: int = payload.get("user_id")
+        role: str = payload.get("role")
+        if payload.get("typ") != STREAM_TICKET or user_id is None or role is None:
+            raise JWTError("Invalid stream ticket")
+        return TokenData(
+            user_id=user_id, role=role, token_version=payload.get("ver", 0)
+        )
     except JWTError:
         return TokenData(user_id=None, role=None)
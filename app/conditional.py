@@ -0,0 +1,74 @@
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# Conditional GET for listings: one aggregate over the filtered rows gives a
+# validator, and a matching If-None-Match is answered with 304 before any page
+# is fetched or serialized.
+#
+# There is deliberately no Last-Modified / If-Modified-Since: the newest change
+# among the matching rows does not move when a row leaves the filter (status
+# change, archiving), and HTTP dates only have one second resolution.
+
+
+class Validator:
+    __slots__ = ("etag", "count")
+
+    def __init__(self, etag: str, count: int):
+        self.etag = etag
+        self.count = count
+
+    def headers(self) -> dict:
+        return {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+
+
+async def listing_validator(
+    request: Request, db: AsyncSession, stmt: Select, model
+) -> Validator:
+    """Validator for the rows matched by ``stmt``.
+
+    Built from ``count(*)`` and ``max(coalesce(updated_at, created_at))`` over the
+    same filter, hashed together with the compiled filter and the request query
+    string (page, fields, cursor...), so any insert, update, delete or different
+    page changes the ETag. A row leaving the filter lowers the count; one
+    entering it was just written and moves the newest timestamp.
+    """
+    changed_at = func.coalesce(model.updated_at, model.created_at)
+    aggregate = stmt.with_only_columns(func.count(), func.max(changed_at)).order_by(
+        None
+    )
+    count, newest = (await db.execute(aggregate)).one()
+
+    compiled = stmt.compile()
+    digest = hashlib.sha256(
+        "|".join(
+            (
+                str(compiled),
+                repr(sorted(compiled.params.items())),
+                request.url.query,
+                str(count),
+                newest.isoformat() if newest else "",
+            )
+        ).encode()
+    ).hexdigest()
+    return Validator(f'W/"{digest[:32]}"', count)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # weak comparison: W/"x" and "x" are the same validator
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return if_none_match is not None and _etag_matches(if_none_match, validator.etag)
+
+
+def not_modified_response(validator: Validator) -> Response:
+    return Response(status_code=304, headers=validator.headers())
@@ -14,13 +14,104 @@ DB_NAME = os.getenv("DB_NAME")
 SQLALCHEMY_DATABASE_URL = (
     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# Connection pool of each engine (sync, async and every replica), per process.
+# `python -m app.serve` derives both from DB_CONNECTION_BUDGET when it is set.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
+# Optional read replicas: comma separated SQLAlchemy async URLs
+# (postgresql+asyncpg://...). Read-only endpoints are spread over them
+# round-robin; without any, every query goes to the primary.
+DB_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()
+]
+# After a user's own write, their reads stay on the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+# Run Base.metadata.create_all on startup (development only, use Alembic in prod)
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "true").lower() == "true"
 
 # JWT / Auth
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+# Trust token claims for authorization instead of loading the user per request.
+# Revocation is enforced through users.token_version, served from the user cache.
+STATELESS_AUTH = os.getenv("STATELESS_AUTH", "false").lower() == "true"
+
+# In-process user cache. Each worker process has its own: /auth/revoke takes
+# effect at once in the process that served it, but other processes keep
+# accepting the revoked tokens until their cached entry expires, i.e. for up to
+# USER_CACHE_TTL seconds (with or without STATELESS_AUTH). Lower the TTL where
+# that window matters.
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 60))  # seconds
 
 # Pagination
 MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
 DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 10))
+# Listing counts: cached exact counts and planner estimates
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", 1024))
+COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", 30))  # seconds
+# Below this planner estimate an exact count is cheap enough to run instead
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", 10000))
+# ETag on listings in page mode with an exact count (?count=exact). The
+# validator aggregates the whole filtered set, so cursor mode and
+# cached/estimated/none counts never run it.
+CONDITIONAL_LISTINGS = os.getenv("CONDITIONAL_LISTINGS", "true").lower() == "true"
+
+# /tasks/changes keeps its watermark this far behind the DB clock, so writes
+# whose transaction started earlier but committed later are not skipped
+CHANGES_SAFETY_WINDOW = int(os.getenv("CHANGES_SAFETY_WINDOW", 5))  # seconds
+
+# Instrumentation: warn when a single request issues more statements than this
+SQL_STATEMENT_BUDGET = int(os.getenv("SQL_STATEMENT_BUDGET", 10))
+
+# Bulk endpoints
+MAX_BULK_SIZE = int(os.getenv("MAX_BULK_SIZE", 1000))
+# Rows fetched from the server-side cursor per chunk of /tasks/export
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+# Rejected rows listed individually in a /tasks/import summary
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 1000))
+
+# Password hashing pool
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+)
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 32))
+
+# OpenAPI schema pre-built by `python -m app.openapi_schema`
+OPENAPI_SCHEMA_PATH = os.getenv("OPENAPI_SCHEMA_PATH", "openapi.json")
+
+# Task change feed (WebSocket / SSE). "postgres" fans events out to every worker
+# process through LISTEN/NOTIFY; "local" only reaches this process.
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local")
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "task_events")
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 100))
+EVENTS_KEEPALIVE = int(os.getenv("EVENTS_KEEPALIVE", 15))  # seconds
+# Lifetime of the tickets browsers pass as ?ticket= to open a stream, in place
+# of the access token (which would end up in access logs with the URL)
+STREAM_TICKET_EXPIRE_SECONDS = int(os.getenv("STREAM_TICKET_EXPIRE_SECONDS", 30))
+
+# Server (`python -m app.serve`)
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", 8000))
+# Worker processes; 0 means one per available CPU
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 0))
+# Total connections all workers may open to the primary; 0 keeps DB_POOL_SIZE /
+# DB_MAX_OVERFLOW as they are
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", 0))
+# On SIGTERM, in-flight requests get this long to finish before being cancelled
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", 30))
+
+# Archiving: completed tasks unchanged for ARCHIVE_AFTER_DAYS move to
+# archived_tasks, ARCHIVE_BATCH_SIZE rows per transaction, every
+# ARCHIVE_INTERVAL seconds in each app process (0 disables the background run)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 30))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 1000))
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", 3600))  # seconds
@@ -1,15 +1,151 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from app.constant import SQLALCHEMY_DATABASE_URL
+from app import metrics
+from app.constant import (ASYNC_SQLALCHEMY_DATABASE_URL, DB_MAX_OVERFLOW,
+                          DB_POOL_SIZE, DB_REPLICA_URLS,
+                          READ_YOUR_WRITES_SECONDS, SQLALCHEMY_DATABASE_URL)
+from app.instrumentation import (TimedAsyncAdaptedQueuePool, TimedQueuePool,
+                                 instrument_engine)
 
 # Engine with connection pool settings
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     pool_pre_ping=True,
 )
 
+# Async engine used by the request handlers
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+
+# Read replicas, used by get_read_db for read-only endpoints
+replica_engines = [
+    create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+    for url in DB_REPLICA_URLS
+]
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+for _replica in replica_engines:
+    instrument_engine(_replica.sync_engine)
+
+
+def _sync_engines():
+    yield ("sync",), engine
+    yield ("async",), async_engine.sync_engine
+    for index, replica in enumerate(replica_engines):
+        yield (f"replica{index}",), replica.sync_engine
+
+
+# ---------------- Fork Safety ----------------
+# A process forked after the pools filled (e.g. a preloading process manager)
+# inherits the parent's pooled sockets. The child gets fresh, empty pools as
+# soon as it starts, before anything can check out (and pre-ping) a connection
+# over a socket the parent still uses. The old pools stay referenced: freeing
+# their connections would let the driver send Terminate on those sockets.
+_inherited_pools = []
+
+
+def _reset_pools_after_fork() -> None:
+    for _, sync_engine in _sync_engines():
+        _inherited_pools.append(sync_engine.pool)
+        sync_engine.pool = sync_engine.pool.recreate()
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+def _pool_stats(stat: str):
+    # read engine.pool on each scrape, it is replaced after a fork
+    return lambda: {
+        labels: getattr(sync_engine.pool, stat)()
+        for labels, sync_engine in _sync_engines()
+    }
+
+
+metrics.callback(
+    "db_pool_size", "Configured pool size", _pool_stats("size"), ("engine",)
+)
+metrics.callback(
+    "db_pool_checked_out",
+    "Connections currently checked out",
+    _pool_stats("checkedout"),
+    ("engine",),
+)
+metrics.callback(
+    "db_pool_overflow",
+    "Current overflow (negative while below pool_size)",
+    _pool_stats("overflow"),
+    ("engine",),
+)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
+
+
+# ---------------- Read Routing ----------------
+class RecentWriters:
+    """Users who wrote in the last ``window`` seconds, read from the primary.
+
+    Tracked per process: with several workers, a request served by a worker
+    other than the one that handled the write may still read a lagging replica.
+    """
+
+    def __init__(self, window: float, maxsize: int = 100_000):
+        self.window = window
+        self.maxsize = maxsize
+        self._until: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int) -> None:
+        with self._lock:
+            self._until[user_id] = time.monotonic() + self.window
+            self._until.move_to_end(user_id)
+            while len(self._until) > self.maxsize:
+                self._until.popitem(last=False)
+
+    def __contains__(self, user_id: int) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+recent_writers = RecentWriters(READ_YOUR_WRITES_SECONDS)
+_replica_cycle = itertools.cycle(replica_engines)
+
+
+def mark_write(user_id: int) -> None:
+    """Call after committing a user's write: their reads go to the primary."""
+    if replica_engines:
+        recent_writers.mark(user_id)
+
+
+def read_engine(user_id: Optional[int] = None):
+    """Engine for a read-only query on behalf of ``user_id``."""
+    if not replica_engines or (user_id is not None and user_id in recent_writers):
+        return async_engine
+    return next(_replica_cycle)
@@ -1,11 +1,18 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import auth, models
-from app.database import SessionLocal
+from app import auth, models, schemas
+from app.constant import STATELESS_AUTH
+from app.database import (AsyncSessionLocal, SessionLocal, read_engine,
+                          replica_engines)
+from app.user_cache import get_user_by_id, load_user_by_id, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
 def get_db() -> Session:
@@ -16,12 +23,50 @@ def get_db() -> Session:
         db.close()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> models.User:
+async def get_async_db() -> AsyncSession:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _decode_access_token(token: str, request: Optional[Request] = None):
+    """``auth.decode_access_token`` at most once per request.
+
+    Returns the ``TokenData`` or the exception it raised; both are kept on
+    ``request.state`` for the other dependencies of the same request.
+    """
+    cached = getattr(request.state, "access_token", None) if request else None
+    if cached is not None and cached[0] == token:
+        return cached[1]
     try:
-        token_data = auth.decode_access_token(token)
-    except Exception:
+        decoded = auth.decode_access_token(token)
+    except Exception as exc:
+        decoded = exc
+    if request is not None:
+        request.state.access_token = (token, decoded)
+    return decoded
+
+
+async def get_read_db(
+    request: Request, token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> AsyncSession:
+    """Session for read-only handlers, bound to a replica when any are set.
+
+    The caller's own writes within ``READ_YOUR_WRITES_SECONDS`` are read back
+    from the primary. Authentication is left to the handler's other
+    dependencies; the token is only looked at for routing.
+    """
+    user_id = None
+    if replica_engines and token:
+        decoded = _decode_access_token(token, request)
+        if not isinstance(decoded, Exception):
+            user_id = decoded.user_id
+    async with AsyncSessionLocal(bind=read_engine(user_id)) as db:
+        yield db
+
+
+def _decode_token(token: str, request: Optional[Request] = None) -> schemas.TokenData:
+    token_data = _decode_access_token(token, request)
+    if isinstance(token_data, Exception):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token"
         )
@@ -30,26 +75,122 @@ def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+    return token_data
+
+
+def _check_token_version(token_data: schemas.TokenData, version) -> None:
+    if version is None or token_data.token_version != version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked"
+        )
+
+
+async def get_token_version(user_id: int):
+    """Current token version of a user, served from the in-process user cache."""
+    user = user_cache.get(user_id)
+    if user is None:
+        async with AsyncSessionLocal(bind=read_engine(user_id)) as db:
+            user = await load_user_by_id(db, user_id)
+    return user.token_version if user else None
+
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db),
+) -> schemas.CachedUser:
+    token_data = _decode_token(token, request)
 
-    user = db.query(models.User).filter(models.User.id == token_data.user_id).first()
+    user = await get_user_by_id(db, token_data.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
+    _check_token_version(token_data, user.token_version)
     return user
 
 
-def require_manager(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+async def _principal_from_user(
+    current_user: schemas.CachedUser = Depends(get_current_user),
+) -> schemas.Principal:
+    return schemas.Principal(id=current_user.id, role=current_user.role)
+
+
+async def get_token_claims(
+    request: Request, token: str = Depends(oauth2_scheme)
+) -> schemas.TokenData:
+    """Claims of the caller's access token, once it is checked for revocation."""
+    token_data = _decode_token(token, request)
+    _check_token_version(token_data, await get_token_version(token_data.user_id))
+    return token_data
+
+
+async def principal_from_token(
+    token: str, request: Optional[Request] = None
+) -> schemas.Principal:
+    """Resolve an access token without a request-scoped DB session."""
+    token_data = await get_token_claims(request, token)
+    return schemas.Principal(id=token_data.user_id, role=token_data.role)
+
+
+async def _principal_from_token(
+    request: Request, token: str = Depends(oauth2_scheme)
+) -> schemas.Principal:
+    return await principal_from_token(token, request)
+
+
+# With STATELESS_AUTH the caller is taken from the validated token claims, so
+# authorizing a request needs no database round trip.
+get_current_principal = (
+    _principal_from_token if STATELESS_AUTH else _principal_from_user
+)
+
+
+async def require_manager(
+    current_user: schemas.Principal = Depends(get_current_principal),
+) -> schemas.Principal:
     if current_user.role != models.UserRole.manager:
         raise HTTPException(status_code=403, detail="Manager role required")
     return current_user
 
 
-def require_worker(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+async def require_worker(
+    current_user: schemas.Principal = Depends(get_current_principal),
+) -> schemas.Principal:
     if current_user.role != models.UserRole.worker:
         raise HTTPException(status_code=403, detail="Worker role required")
     return current_user
+
+
+async def principal_from_ticket(ticket: str) -> schemas.Principal:
+    """Resolve a stream ticket (``auth.create_stream_ticket``)."""
+    token_data = auth.decode_stream_ticket(ticket)
+    if not token_data.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired ticket",
+        )
+    _check_token_version(token_data, await get_token_version(token_data.user_id))
+    return schemas.Principal(id=token_data.user_id, role=token_data.role)
+
+
+async def get_stream_principal(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(
+        None, description="Stream ticket, for clients that cannot set headers"
+    ),
+) -> schemas.Principal:
+    """Caller of a long-lived stream.
+
+    Browsers' EventSource cannot send an Authorization header, so they pass a
+    short-lived ticket from ``POST /tasks/events/ticket`` as ``?ticket=``; the
+    access token itself never goes in a URL. No session is held open for the
+    stream's lifetime.
+    """
+    if header_token:
+        return await principal_from_token(header_token)
+    if ticket:
+        return await principal_from_ticket(ticket)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+    )
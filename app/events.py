@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, Set
+
+import asyncpg
+from sqlalchemy import text
+
+from app import metrics, schemas
+from app.constant import (ASYNC_SQLALCHEMY_DATABASE_URL, EVENT_QUEUE_SIZE,
+                          EVENTS_BACKEND, EVENTS_CHANNEL)
+from app.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+
+# NOTIFY payloads are capped at 8000 bytes by Postgres
+NOTIFY_MAX_PAYLOAD = 7999
+
+
+def task_event(event_type: str, task) -> schemas.TaskEvent:
+    return schemas.TaskEvent(type=event_type, task=schemas.TaskOut.model_validate(task))
+
+
+# ---------------- Backends ----------------
+class LocalBackend:
+    """Delivers events to subscribers of this process only."""
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, events: Iterable[schemas.TaskEvent]) -> None:
+        for event in events:
+            self.deliver(event)
+
+
+class PostgresBackend:
+    """Fans events out through ``LISTEN/NOTIFY`` to every worker process.
+
+    Each process keeps one dedicated asyncpg connection listening on
+    ``EVENTS_CHANNEL``; publishing is a single ``pg_notify`` statement over the
+    regular pool. Delivery then happens from the notification, including for
+    subscribers of the publishing process.
+    """
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, deliver, dsn: str, channel: str = EVENTS_CHANNEL):
+        self.deliver = deliver
+        self.dsn = dsn
+        self.channel = channel
+        self._connection = None
+        self._reconnect_task = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._connection = await asyncpg.connect(self.dsn)
+        self._connection.add_termination_listener(self._on_terminated)
+        await self._connection.add_listener(self.channel, self._on_notify)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.deliver(schemas.TaskEvent.model_validate_json(payload))
+        except ValueError:
+            logger.warning("Dropping malformed %s notification", channel)
+
+    def _on_terminated(self, connection) -> None:
+        if not self._stopping:
+            logger.warning("Lost LISTEN connection on %s, reconnecting", self.channel)
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.RECONNECT_DELAY)
+            try:
+                await self.start()
+                return
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as exc:
+                logger.warning("LISTEN reconnect failed: %s", exc)
+
+    @staticmethod
+    def _payload(event: schemas.TaskEvent) -> str:
+        payload = event.model_dump_json()
+        if len(payload.encode()) > NOTIFY_MAX_PAYLOAD:
+            # clients refetch the task for the full description
+            payload = event.model_copy(
+                update={"task": event.task.model_copy(update={"description": None})}
+            ).model_dump_json()
+        return payload
+
+    async def publish(self, events: Iterable[schemas.TaskEvent]) -> None:
+        payloads = [self._payload(event) for event in events]
+        if not payloads:
+            return
+        stmt = text(
+            "SELECT pg_notify(:channel, payload) "
+            "FROM unnest(CAST(:payloads AS text[])) AS payload"
+        )
+        async with async_engine.begin() as conn:
+            await conn.execute(stmt, {"channel": self.channel, "payloads": payloads})
+
+
+# ---------------- Broker ----------------
+class Broker:
+    """Routes task events to the queues of the users they concern.
+
+    An event goes to the task's assignee and assigner. Each subscription has a
+    bounded queue; a subscriber that falls behind loses its oldest events rather
+    than holding memory for the whole process.
+    """
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self.backend = LocalBackend(self.deliver)
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def deliver(self, event: schemas.TaskEvent) -> None:
+        for user_id in {event.task.assigned_to, event.task.assigned_by}:
+            for queue in self._subscribers.get(user_id, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(event)
+
+    async def publish(self, *events: schemas.TaskEvent) -> None:
+        """Publish after the write committed; failures are logged, not raised."""
+        try:
+            await self.backend.publish(events)
+        except Exception:
+            logger.exception("Failed to publish %d task event(s)", len(events))
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+broker = Broker()
+if EVENTS_BACKEND == "postgres":
+    broker.backend = PostgresBackend(
+        broker.deliver, ASYNC_SQLALCHEMY_DATABASE_URL.replace("+asyncpg", "", 1)
+    )
+
+metrics.callback(
+    "event_subscribers",
+    "Open task event subscriptions (WebSocket and SSE)",
+    lambda: {(): broker.subscriber_count()},
+)
+
+
+def sse_format(event: schemas.TaskEvent) -> str:
+    return f"event: {event.type}\ndata: {event.model_dump_json()}\n\n"
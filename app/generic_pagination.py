@@ -1,36 +1,278 @@
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-from fastapi import Request
-from sqlalchemy.orm import Query
+from fastapi import HTTPException, Request
+from pydantic import create_model
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
-from app.constant import DEFAULT_PAGE_SIZE
+from app.constant import (COUNT_CACHE_SIZE, COUNT_CACHE_TTL,
+                          COUNT_ESTIMATE_THRESHOLD, DEFAULT_PAGE_SIZE,
+                          SECRET_KEY)
 
+CURSOR_NEXT = "n"
+CURSOR_PREVIOUS = "p"
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_NONE = "none"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED, COUNT_NONE)
+
+
+# ---------------- Cursor Encoding ----------------
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(SECRET_KEY.encode(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def encode_cursor(key, direction: str) -> str:
+    payload = json.dumps({"k": key, "d": direction}, separators=(",", ":")).encode()
+    body = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{body}.{_sign(payload)}"
+
+
+def decode_cursor(cursor: str, parse_key=int):
+    try:
+        body, signature = cursor.split(".", 1)
+        payload = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("Bad cursor signature")
+        data = json.loads(payload)
+        key, direction = parse_key(data["k"]), data["d"]
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+            raise ValueError("Bad cursor direction")
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key, direction
+
+
+def encode_watermark(changed_at: datetime, key: int) -> str:
+    payload = json.dumps(
+        {"t": changed_at.isoformat(), "k": key}, separators=(",", ":")
+    ).encode()
+    body = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{body}.{_sign(payload)}"
+
+
+def decode_watermark(watermark: str) -> Tuple[datetime, int]:
+    try:
+        body, signature = watermark.split(".", 1)
+        payload = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("Bad watermark signature")
+        data = json.loads(payload)
+        changed_at, key = datetime.fromisoformat(data["t"]), int(data["k"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+    return changed_at, key
+
+
+# ---------------- Projection ----------------
+def schema_columns(model, schema, names=None) -> tuple:
+    """Columns of ``model`` backing the fields of ``schema`` (or ``names``)."""
+    return tuple(getattr(model, name) for name in names or schema.model_fields)
+
+
+@lru_cache(maxsize=None)
+def _sparse_schema(schema, names: Tuple[str, ...]):
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=schema.model_config,
+        **{name: (schema.model_fields[name].annotation, ...) for name in names},
+    )
+
+
+def projection(model, schema, fields: Optional[str] = None, key: str = "id"):
+    """Columns to select for a listing and the item schema to render them with.
+
+    ``fields`` is a comma separated sparse fieldset (``?fields=id,title``); only
+    those columns are fetched and emitted. The ``key`` column is always selected
+    so cursor links can still be built, even when it is not emitted.
+    """
+    names = tuple(
+        dict.fromkeys(
+            name.strip() for name in (fields or "").split(",") if name.strip()
+        )
+    )
+    if not names:
+        return schema_columns(model, schema), schema
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    selected = names if key in names else (key, *names)
+    return schema_columns(model, schema, selected), _sparse_schema(schema, names)
+
+
+# ---------------- Query Helpers ----------------
+async def count_rows(db: AsyncSession, stmt: Select) -> int:
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    return (await db.execute(count_stmt)).scalar_one()
+
+
+class explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a select, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+async def estimate_rows(db: AsyncSession, stmt: Select) -> int:
+    """Planner row estimate for ``stmt``; no rows are read."""
+    plan = (await db.execute(explain(stmt.order_by(None)))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CountCache:
+    """Exact counts keyed by the compiled filter, kept for a short TTL.
+
+    Task writes call ``invalidate`` so a manager does not see a stale total
+    right after creating or updating tasks in this process.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(stmt: Select) -> tuple:
+        compiled = stmt.order_by(None).compile()
+        return str(compiled), tuple(sorted(compiled.params.items()))
+
+    def get(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            total, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return total
+
+    def put(self, key: tuple, total: int) -> None:
+        with self._lock:
+            self._entries[key] = (total, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(COUNT_CACHE_SIZE, COUNT_CACHE_TTL)
 
-def paginate_query(
-    request: Request, query: Query, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE
-):
-    page = max(page, 1)
-    page_size = max(page_size, 1)
 
-    total = query.count()
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
+async def count_total(
+    db: AsyncSession,
+    stmt: Select,
+    strategy: str = COUNT_EXACT,
+    known: Optional[int] = None,
+) -> Optional[int]:
+    """Total rows matched by ``stmt`` according to ``strategy``.
 
+    * ``exact``: ``SELECT count(*)`` over the filtered query.
+    * ``cached``: exact, reused for ``COUNT_CACHE_TTL`` seconds per filter.
+    * ``estimated``: the planner's row estimate, falling back to an exact count
+      when the estimate is below ``COUNT_ESTIMATE_THRESHOLD``.
+    * ``none``: no count at all (``None``).
+
+    ``known`` is an exact count the caller already has for the same filter.
+    """
+    if strategy == COUNT_NONE:
+        return None
+    if known is not None and strategy in (COUNT_EXACT, COUNT_CACHED):
+        return known
+    if strategy == COUNT_ESTIMATED:
+        estimate = await estimate_rows(db, stmt)
+        if estimate >= COUNT_ESTIMATE_THRESHOLD:
+            return estimate
+    if strategy == COUNT_CACHED:
+        key = CountCache.key(stmt)
+        total = count_cache.get(key)
+        if total is None:
+            total = await count_rows(db, stmt)
+            count_cache.put(key, total)
+        return total
+    return await count_rows(db, stmt)
+
+
+async def fetch_all(db: AsyncSession, stmt: Select) -> list:
+    # listings select plain columns, so rows come back as lightweight tuples
+    return (await db.execute(stmt)).all()
+
+
+# ---------------- URL Helpers ----------------
+def _url_builder(request: Request):
     # Preserve base URL and existing query params
     url_parts = urlparse(str(request.url))
     query_params = parse_qs(url_parts.query)
 
-    def build_url(page_num: int):
-        query_params_updated = {
-            **query_params,
-            "page": [str(page_num)],
-            "page_size": [str(page_size)],
-        }
+    def build_url(**params):
+        query_params_updated = {**query_params}
+        for name, value in params.items():
+            if value is None:
+                query_params_updated.pop(name, None)
+            else:
+                query_params_updated[name] = [str(value)]
         return urlunparse(
             url_parts._replace(query=urlencode(query_params_updated, doseq=True))
         )
 
-    next_url = build_url(page + 1) if (page * page_size) < total else None
-    prev_url = build_url(page - 1) if page > 1 else None
+    return build_url
+
+
+# ---------------- Offset Pagination ----------------
+async def paginate_query(
+    request: Request,
+    db: AsyncSession,
+    stmt: Select,
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    count: str = COUNT_EXACT,
+    total: Optional[int] = None,
+):
+    page = max(page, 1)
+    page_size = max(page_size, 1)
+
+    total = await count_total(db, stmt, count, total)
+    items = await fetch_all(
+        db, stmt.offset((page - 1) * page_size).limit(page_size + 1)
+    )
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    build_url = _url_builder(request)
+    next_url = build_url(page=page + 1, page_size=page_size) if has_more else None
+    prev_url = build_url(page=page - 1, page_size=page_size) if page > 1 else None
 
     return {
         "count": total,
@@ -40,3 +282,137 @@ def paginate_query(
         "previous": prev_url,
         "results": items,
     }
+
+
+# ---------------- Cursor (Keyset) Pagination ----------------
+async def paginate_cursor(
+    request: Request,
+    db: AsyncSession,
+    stmt: Select,
+    key,
+    cursor: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    count: str = COUNT_NONE,
+    total: Optional[int] = None,
+):
+    """Keyset pagination over ``key`` (a unique, ascending column such as ``id``).
+
+    Cost does not depend on how deep the page is: each page is a single
+    ``WHERE key > :last ORDER BY key LIMIT n + 1`` instead of an OFFSET scan, and
+    by default no total count is computed.
+    """
+    page_size = max(page_size, 1)
+    total = await count_total(db, stmt, count, total)
+
+    stmt = stmt.order_by(None)
+    if cursor is None:
+        direction = CURSOR_NEXT
+        stmt = stmt.order_by(key)
+    else:
+        last_key, direction = decode_cursor(cursor)
+        if direction == CURSOR_NEXT:
+            stmt = stmt.where(key > last_key).order_by(key)
+        else:
+            stmt = stmt.where(key < last_key).order_by(key.desc())
+
+    items = await fetch_all(db, stmt.limit(page_size + 1))
+    return _keyset_page(
+        request,
+        items,
+        page_size,
+        cursor,
+        direction,
+        lambda row: getattr(row, key.key),
+        total,
+    )
+
+
+def _keyset_page(
+    request: Request,
+    items: list,
+    page_size: int,
+    cursor: Optional[str],
+    direction: str,
+    cursor_key,
+    total: Optional[int] = None,
+):
+    """Trim the ``page_size + 1`` rows fetched and build the next/previous links."""
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    if direction == CURSOR_PREVIOUS:
+        items.reverse()
+
+    if direction == CURSOR_NEXT:
+        has_next, has_prev = has_more, cursor is not None
+    else:
+        has_next, has_prev = True, has_more
+
+    build_url = _url_builder(request)
+    next_url = prev_url = None
+    if items and has_next:
+        next_url = build_url(
+            cursor=encode_cursor(cursor_key(items[-1]), CURSOR_NEXT),
+            page=None,
+            page_size=page_size,
+        )
+    if items and has_prev:
+        prev_url = build_url(
+            cursor=encode_cursor(cursor_key(items[0]), CURSOR_PREVIOUS),
+            page=None,
+            page_size=page_size,
+        )
+
+    return {
+        "count": total,
+        "page_size": page_size,
+        "next": next_url,
+        "previous": prev_url,
+        "results": items,
+    }
+
+
+# ---------------- Ranked (Keyset) Pagination ----------------
+def _parse_ranked_key(key) -> Tuple[float, int]:
+    rank, row_key = key
+    return float(rank), int(row_key)
+
+
+async def paginate_ranked(
+    request: Request,
+    db: AsyncSession,
+    stmt: Select,
+    rank,
+    key,
+    cursor: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+):
+    """Keyset pagination over ``rank DESC, key ASC`` (e.g. search relevance).
+
+    ``stmt`` must select ``rank`` labelled ``"rank"``. The cursor carries the
+    ``(rank, key)`` of the boundary row; ``(-rank, key)`` orders the same way
+    ascending, so a single row comparison finds the next page.
+    """
+    page_size = max(page_size, 1)
+    sort_key = tuple_(-rank, key)
+
+    stmt = stmt.order_by(None)
+    if cursor is None:
+        direction = CURSOR_NEXT
+        stmt = stmt.order_by(rank.desc(), key)
+    else:
+        (last_rank, last_key), direction = decode_cursor(cursor, _parse_ranked_key)
+        boundary = tuple_(literal(-last_rank, rank.type), last_key)
+        if direction == CURSOR_NEXT:
+            stmt = stmt.where(sort_key > boundary).order_by(rank.desc(), key)
+        else:
+            stmt = stmt.where(sort_key < boundary).order_by(rank, key.desc())
+
+    items = await fetch_all(db, stmt.limit(page_size + 1))
+    return _keyset_page(
+        request,
+        items,
+        page_size,
+        cursor,
+        direction,
+        lambda row: [row.rank, getattr(row, key.key)],
+    )
@@ -1,4 +1,6 @@
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -8,3 +10,32 @@ def safe_commit(db: Session):
     except SQLAlchemyError:
         db.rollback()
         raise
+
+
+async def async_safe_commit(db: AsyncSession):
+    try:
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+
+
+# ---------------- Single-statement writes ----------------
+# Writes read their result back through RETURNING instead of a follow-up
+# SELECT (``db.refresh``), so each one is a single statement plus the commit.
+async def insert_returning(db: AsyncSession, stmt, *columns):
+    """Execute an INSERT and return the first returned row, or None."""
+    result = await db.execute(stmt.returning(*columns))
+    return result.first()
+
+
+async def insert_row(db: AsyncSession, model, values: dict, *columns):
+    return await insert_returning(db, insert(model).values(**values), *columns)
+
+
+async def update_returning(db: AsyncSession, stmt, *columns):
+    """Execute an UPDATE and return the first updated row, or None."""
+    result = await db.execute(
+        stmt.returning(*columns).execution_options(synchronize_session=False)
+    )
+    return result.first()
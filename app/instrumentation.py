@@ -0,0 +1,173 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app import metrics
+from app.constant import SQL_STATEMENT_BUDGET
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time spent in the handler, by route template",
+    ("method", "route"),
+)
+REQUESTS = metrics.counter(
+    "http_requests_total",
+    "Completed requests, by route template and status code",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight", "Requests currently being handled"
+)
+REQUEST_DB_TIME = metrics.histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ("route",)
+)
+REQUEST_POOL_WAIT = metrics.histogram(
+    "http_request_pool_wait_seconds",
+    "Time spent waiting for a pooled DB connection per request",
+    ("route",),
+)
+REQUEST_STATEMENTS = metrics.histogram(
+    "http_request_sql_statements",
+    "SQL statements issued per request",
+    ("route",),
+    buckets=STATEMENT_BUCKETS,
+)
+
+
+# ---------------- Per-request Stats ----------------
+class RequestStats:
+    __slots__ = ("statements", "db_time", "pool_wait")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+# ---------------- Engine Hooks ----------------
+# The start time is kept on the execution context rather than a stack in
+# conn.info: a failing statement never reaches after_cursor_execute, and its
+# leftover entry would pair every later statement with the wrong start time.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _record_statement(context) -> None:
+    start = None if context is None else vars(context).pop("_query_start_time", None)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        if start is not None:
+            stats.db_time += time.perf_counter() - start
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(context)
+
+
+def _handle_error(exception_context) -> None:
+    # a statement that failed: still counted, with the time it took to fail
+    context = exception_context.execution_context
+    if context is not None and "_query_start_time" in vars(context):
+        _record_statement(context)
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement counting/timing hooks to a (sync) Engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class _TimedCheckoutMixin:
+    """Records how long a request waited for a pooled connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.pool_wait += time.perf_counter() - start
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# ---------------- Per-route Aggregates ----------------
+def record_route(
+    method: str, route: str, status: int, stats: RequestStats, handler_time: float
+) -> None:
+    REQUEST_DURATION.observe(handler_time, (method, route))
+    REQUESTS.inc(1, (method, route, str(status)))
+    REQUEST_DB_TIME.observe(stats.db_time, (route,))
+    REQUEST_POOL_WAIT.observe(stats.pool_wait, (route,))
+    REQUEST_STATEMENTS.observe(stats.statements, (route,))
+
+
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return route.path if route is not None else "<unmatched>"
+
+
+# ---------------- Middleware ----------------
+async def timing_middleware(request: Request, call_next):
+    """Times the request and adds a ``Server-Timing`` header.
+
+    Runs as an HTTP middleware, so the measurement ends when the response
+    headers are sent. For streaming responses (the event stream, exports) it
+    covers only the handler that opened the stream, not the rows sent after.
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stats.reset(token)
+        REQUESTS_IN_FLIGHT.dec()
+    handler_time = time.perf_counter() - start
+
+    route = route_template(request)
+    record_route(request.method, route, response.status_code, stats, handler_time)
+    if stats.statements > SQL_STATEMENT_BUDGET:
+        logger.warning(
+            "Possible N+1: %s %s issued %d SQL statements (budget %d)",
+            request.method,
+            route,
+            stats.statements,
+            SQL_STATEMENT_BUDGET,
+        )
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} statements", '
+        f"pool;dur={stats.pool_wait * 1000:.2f}, "
+        f"app;dur={handler_time * 1000:.2f}"
+    )
+    return response
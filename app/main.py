@@ -1,14 +1,23 @@
 import logging
 import os
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.docs import (get_redoc_html, get_swagger_ui_html,
+                                  get_swagger_ui_oauth2_redirect_html)
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import OAuth2PasswordBearer
 
+from app import metrics
+from app.auth import PasswordPoolBusy
+from app.constant import DB_CREATE_ALL
 from app.database import Base, engine
-from app.routers import auth_router, tasks_router
+from app.events import broker
+from app.instrumentation import timing_middleware
+from app.openapi_schema import get_document
+from app.routers import auth_router, events_router, tasks_router
+from app.task_archive import archiver
 
 # ---------------- Logging Setup ----------------
 logging.basicConfig(
@@ -25,7 +34,12 @@ app = FastAPI(
     title="Todo App (Manager/Worker)",
     description="API for managing tasks with JWT authentication",
     version="1.0.0",
+    # schema and docs are served below from the pre-encoded document
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
+OPENAPI_URL = "/openapi.json"
 
 # ---------------- CORS Middleware ----------------
 app.add_middleware(
@@ -36,9 +50,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------- Request Timing Middleware ----------------
+app.middleware("http")(timing_middleware)
+
 # ---------------- Routers ----------------
 app.include_router(auth_router.router)
 app.include_router(tasks_router.router)
+app.include_router(events_router.router)
 
 # ---------------- OAuth2 JWT Scheme ----------------
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=JWT_LOGIN_URL)
@@ -48,8 +66,19 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=JWT_LOGIN_URL)
 @app.on_event("startup")
 def startup_event():
     # Only for development, production should use Alembic migrations
-    logger.info("Application startup: checking DB tables...")
-    Base.metadata.create_all(bind=engine)
+    if DB_CREATE_ALL:
+        logger.info("Application startup: checking DB tables...")
+        Base.metadata.create_all(bind=engine)
+
+
+@app.on_event("startup")
+async def start_event_broker():
+    await broker.start()
+
+
+@app.on_event("startup")
+async def start_archiver():
+    await archiver.start()
 
 
 @app.on_event("shutdown")
@@ -57,6 +86,16 @@ def shutdown_event():
     logger.info("Application shutdown")
 
 
+@app.on_event("shutdown")
+async def stop_event_broker():
+    await broker.stop()
+
+
+@app.on_event("shutdown")
+async def stop_archiver():
+    await archiver.stop()
+
+
 # ---------------- Global Exception Handler ----------------
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -64,12 +103,30 @@ async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(status_code=500, content={"message": "Internal server error"})
 
 
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    logger.warning("Password pool saturated, rejecting request")
+    return JSONResponse(
+        status_code=503,
+        content={"message": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # ---------------- Root Endpoint ----------------
 @app.get("/", tags=["Root"])
 def root():
     return {"message": "Todo App API is running"}
 
 
+# ---------------- Metrics Endpoint ----------------
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ---------------- Custom OpenAPI for JWT ----------------
 def custom_openapi():
     if app.openapi_schema:
@@ -96,3 +153,37 @@ def custom_openapi():
 
 
 app.openapi = custom_openapi
+
+
+# ---------------- OpenAPI / Docs Endpoints ----------------
+@app.get(OPENAPI_URL, include_in_schema=False)
+def openapi_json(request: Request):
+    document = get_document(app.openapi)
+    headers = {"ETag": document.etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == document.etag:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = document.gzipped
+    else:
+        body = document.body
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/docs", include_in_schema=False)
+def swagger_ui():
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+def redoc():
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
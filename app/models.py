@@ -1,8 +1,9 @@
 import enum
 
-from sqlalchemy import (Column, DateTime, Enum, ForeignKey, Integer, String,
-                        Text)
-from sqlalchemy.orm import relationship
+from sqlalchemy import (DDL, Column, Computed, DateTime, Enum, ForeignKey,
+                        Index, Integer, String, Text, event, text)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -28,12 +29,27 @@ class User(Base):
     mobile = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum(UserRole, name="userrole", native_enum=True), nullable=False)
+    # bumped to revoke every token issued so far
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    # fetch server defaults through RETURNING instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # list_workers: role = 'worker' ORDER BY id
+        Index(
+            "ix_users_role_id",
+            "role",
+            "id",
+            postgresql_where=text("role = 'worker'"),
+        ),
+    )
+
     # relationships
     tasks_assigned_to = relationship(
         "Task",
@@ -50,6 +66,14 @@ class User(Base):
 
 
 # ---------------- Task Model ----------------
+# Text search configuration of tasks.search_vector; changing it needs a migration
+SEARCH_CONFIG = "english"
+TASK_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -70,6 +94,37 @@ class Task(Base):
     )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    # generated by Postgres from title/description, only read by /tasks/search
+    search_vector = deferred(Column(TSVECTOR, Computed(TASK_SEARCH_VECTOR)))
+
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # my_tasks: assigned_to / assigned_by [+ status] ORDER BY id
+        Index("ix_tasks_assigned_to_status_id", "assigned_to", "status", "id"),
+        Index("ix_tasks_assigned_by_status_id", "assigned_by", "status", "id"),
+        # /tasks/changes: keyset on (coalesce(updated_at, created_at), id)
+        Index(
+            "ix_tasks_assigned_to_changed_at_id",
+            assigned_to,
+            func.coalesce(updated_at, created_at),
+            id,
+        ),
+        Index(
+            "ix_tasks_assigned_by_changed_at_id",
+            assigned_by,
+            func.coalesce(updated_at, created_at),
+            id,
+        ),
+        # archiver: completed tasks, oldest change first
+        Index(
+            "ix_tasks_completed_changed_at",
+            func.coalesce(updated_at, created_at),
+            postgresql_where=text("status = 'completed'"),
+        ),
+    )
+
     # relationships
     assignee = relationship(
         "User", foreign_keys=[assigned_to], back_populates="tasks_assigned_to"
@@ -77,3 +132,122 @@ class Task(Base):
     assigner = relationship(
         "User", foreign_keys=[assigned_by], back_populates="tasks_assigned_by"
     )
+
+
+# ---------------- Archived Task Model ----------------
+class ArchivedTask(Base):
+    """Completed tasks moved out of ``tasks`` by ``app.task_archive``.
+
+    Rows keep their original id, so ``my_tasks?include_archived=true`` can
+    merge both tables in id order. Read-only: nothing updates an archived task.
+    """
+
+    __tablename__ = "archived_tasks"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(
+        Enum(TaskStatus, name="taskstatus", native_enum=True), nullable=False
+    )
+
+    assigned_to = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assigned_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # same expression as tasks.search_vector, for /tasks/search
+    search_vector = deferred(Column(TSVECTOR, Computed(TASK_SEARCH_VECTOR)))
+
+    __table_args__ = (
+        Index(
+            "ix_archived_tasks_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        # my_tasks?include_archived: assigned_to / assigned_by ORDER BY id
+        Index("ix_archived_tasks_assigned_to_id", "assigned_to", "id"),
+        Index("ix_archived_tasks_assigned_by_id", "assigned_by", "id"),
+    )
+
+
+# ---------------- Task Status Counters ----------------
+class TaskStatusCount(Base):
+    """Number of tasks per (manager, worker, status).
+
+    Maintained by statement-level triggers on ``tasks`` (see
+    ``TASK_STATUS_COUNT_TRIGGERS``); rebuilt from scratch by
+    ``python -m app.task_stats reconcile``. Deleting tasks does not decrement the
+    counters: archived tasks keep counting.
+    """
+
+    __tablename__ = "task_status_counts"
+
+    assigned_by = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    assigned_to = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(
+        Enum(TaskStatus, name="taskstatus", native_enum=True), primary_key=True
+    )
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # worker dashboards read their own row set
+        Index("ix_task_status_counts_assigned_to", "assigned_to"),
+    )
+
+
+# Transition tables let one trigger run per statement, so a bulk insert or
+# update adjusts each counter once instead of once per row.
+TASK_STATUS_COUNT_TRIGGERS = """
+CREATE OR REPLACE FUNCTION task_status_counts_on_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_status_counts AS c (assigned_by, assigned_to, status, count)
+    SELECT assigned_by, assigned_to, status, count(*)
+    FROM new_rows
+    GROUP BY assigned_by, assigned_to, status
+    ORDER BY assigned_by, assigned_to, status
+    ON CONFLICT (assigned_by, assigned_to, status)
+    DO UPDATE SET count = c.count + EXCLUDED.count;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION task_status_counts_on_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_status_counts AS c (assigned_by, assigned_to, status, count)
+    SELECT assigned_by, assigned_to, status, sum(delta)
+    FROM (
+        SELECT assigned_by, assigned_to, status, -1 AS delta FROM old_rows
+        UNION ALL
+        SELECT assigned_by, assigned_to, status, 1 AS delta FROM new_rows
+    ) AS changes
+    GROUP BY assigned_by, assigned_to, status
+    HAVING sum(delta) <> 0
+    ORDER BY assigned_by, assigned_to, status
+    ON CONFLICT (assigned_by, assigned_to, status)
+    DO UPDATE SET count = c.count + EXCLUDED.count;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS tasks_status_counts_insert ON tasks;
+CREATE TRIGGER tasks_status_counts_insert
+AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_on_insert();
+
+DROP TRIGGER IF EXISTS tasks_status_counts_update ON tasks;
+CREATE TRIGGER tasks_status_counts_update
+AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_on_update();
+"""
+
+# create_all (development) gets the triggers too; Alembic creates them in 0007
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(TASK_STATUS_COUNT_TRIGGERS).execute_if(dialect="postgresql"),
+)
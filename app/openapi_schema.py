@@ -0,0 +1,55 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+from typing import Callable, Optional
+
+from app.constant import OPENAPI_SCHEMA_PATH
+
+
+class OpenAPIDocument:
+    """OpenAPI schema encoded once, ready to be served as-is."""
+
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9)
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def encode_schema(schema: dict) -> bytes:
+    return json.dumps(schema, separators=(",", ":")).encode()
+
+
+_document: Optional[OpenAPIDocument] = None
+
+
+def get_document(build_schema: Callable[[], dict]) -> OpenAPIDocument:
+    """Serve the file written at build time, else build the schema once."""
+    global _document
+    if _document is None:
+        if os.path.exists(OPENAPI_SCHEMA_PATH):
+            with open(OPENAPI_SCHEMA_PATH, "rb") as f:
+                body = f.read()
+        else:
+            body = encode_schema(build_schema())
+        _document = OpenAPIDocument(body)
+    return _document
+
+
+# ---------------- Build-time Command ----------------
+# python -m app.openapi_schema [output_path]
+def main(argv=None) -> None:
+    from app.main import app
+
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else OPENAPI_SCHEMA_PATH
+    with open(path, "wb") as f:
+        f.write(encode_schema(app.openapi()))
+    print(f"OpenAPI schema written to {path}")
+
+
+if __name__ == "__main__":
+    main()
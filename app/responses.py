@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+class ModelJSONResponse(Response):
+    """JSON response serialized by pydantic-core straight to bytes.
+
+    ``content`` is validated against ``tp`` from attributes (ORM rows, Row tuples
+    or dicts) and dumped in one pass, skipping FastAPI's generic
+    ``jsonable_encoder`` walk over every item.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, tp, content: Any, **kwargs):
+        self.tp = tp
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        adapter = type_adapter(self.tp)
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
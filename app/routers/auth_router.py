@@ -1,56 +1,63 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import auth, models, schemas
-from app.deps import get_db
+from app.database import mark_write
+from app.deps import get_async_db, get_current_principal, get_token_version
+from app.helpers import async_safe_commit, insert_returning
+from app.user_cache import get_user_by_mobile, user_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 # ---------------- Register ----------------
 @router.post("/register", response_model=schemas.UserOut)
-def register(payload: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(
+    payload: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)
+):
     if payload.role not in (
         models.UserRole.manager.value,
         models.UserRole.worker.value,
     ):
         raise HTTPException(status_code=400, detail="role must be manager or worker")
-    existing = (
-        db.query(models.User).filter(models.User.mobile == payload.mobile).first()
-    )
-    if existing:
+    # Look the mobile up before hashing: a duplicate must not cost a bcrypt run
+    # on the bounded password pool. ON CONFLICT still covers concurrent signups.
+    if await get_user_by_mobile(db, payload.mobile):
         raise HTTPException(status_code=400, detail="Mobile already registered")
-    user = models.User(
-        mobile=payload.mobile,
-        password_hash=auth.hash_password(payload.password),
-        role=payload.role,
+    stmt = (
+        insert(models.User)
+        .values(
+            mobile=payload.mobile,
+            password_hash=await auth.hash_password_async(payload.password),
+            role=payload.role,
+        )
+        .on_conflict_do_nothing(index_elements=[models.User.mobile])
+    )
+    user = await insert_returning(
+        db, stmt, models.User.id, models.User.mobile, models.User.role
     )
-    try:
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    except Exception:
-        db.rollback()
-        raise
+    if not user:
+        raise HTTPException(status_code=400, detail="Mobile already registered")
+    await async_safe_commit(db)
+    # the new user's first requests must not miss the row on a lagging replica
+    mark_write(user.id)
     return user
 
 
 # ---------------- Login ----------------
 @router.post("/login")
-def login(mobile: str, password: str, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.mobile == mobile).first()
-    if not user or not auth.verify_password(password, user.password_hash):
+async def login(mobile: str, password: str, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_mobile(db, mobile)
+    if not user or not await auth.verify_password_async(password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = auth.create_access_token(
-        {"user_id": user.id, "role": user.role.value}
-    )
-    refresh_token = auth.create_refresh_token(
-        {"user_id": user.id, "role": user.role.value}
-    )
+    access_token = auth.create_access_token(auth.token_claims(user))
+    refresh_token = auth.create_refresh_token(auth.token_claims(user))
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -60,15 +67,38 @@ def login(mobile: str, password: str, db: Session = Depends(get_db)):
 
 # ---------------- Refresh ----------------
 @router.post("/refresh")
-def refresh(refresh_token: str):
+async def refresh(refresh_token: str):
     token_data = auth.decode_refresh_token(refresh_token)
-    if not token_data.user_id:
+    if not token_data.user_id or token_data.token_version != await get_token_version(
+        token_data.user_id
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     new_access_token = auth.create_access_token(
-        {"user_id": token_data.user_id, "role": token_data.role}
+        {
+            "user_id": token_data.user_id,
+            "role": token_data.role,
+            "ver": token_data.token_version,
+        }
     )
     return {"access_token": new_access_token, "token_type": "bearer"}
+
+
+# ---------------- Revoke ----------------
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_principal),
+):
+    """Invalidate every access and refresh token issued to the caller so far."""
+    await db.execute(
+        update(models.User)
+        .where(models.User.id == current_user.id)
+        .values(token_version=models.User.token_version + 1)
+    )
+    await async_safe_commit(db)
+    user_cache.invalidate(current_user.id)
+    mark_write(current_user.id)
@@ -0,0 +1,94 @@
+import asyncio
+
+from fastapi import (APIRouter, Depends, HTTPException, WebSocket,
+                     WebSocketDisconnect, status)
+from fastapi.responses import StreamingResponse
+
+from app import auth, schemas
+from app.constant import EVENTS_KEEPALIVE, STREAM_TICKET_EXPIRE_SECONDS
+from app.deps import (get_stream_principal, get_token_claims,
+                      principal_from_ticket, principal_from_token)
+from app.events import broker, sse_format
+
+router = APIRouter(prefix="", tags=["events"])
+
+# Push channels for task changes: a client keeps one of these open instead of
+# polling /tasks/my. Events are TaskEvent documents ("task.created" /
+# "task.updated") for tasks the caller assigned or is assigned to.
+
+
+# ----------------- Stream Tickets -----------------
+@router.post("/tasks/events/ticket", response_model=schemas.StreamTicket)
+async def stream_ticket(token_data: schemas.TokenData = Depends(get_token_claims)):
+    """Short-lived ticket for clients that cannot set headers (``?ticket=``)."""
+    ticket = auth.create_stream_ticket(
+        {
+            "user_id": token_data.user_id,
+            "role": token_data.role,
+            "ver": token_data.token_version,
+        }
+    )
+    return {"ticket": ticket, "expires_in": STREAM_TICKET_EXPIRE_SECONDS}
+
+
+# ----------------- Server-Sent Events -----------------
+@router.get("/tasks/events", response_class=StreamingResponse)
+async def task_events(principal: schemas.Principal = Depends(get_stream_principal)):
+    async def stream():
+        async with broker.subscribe(principal.id) as queue:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_format(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ----------------- WebSocket -----------------
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/tasks/ws")
+async def task_events_ws(websocket: WebSocket):
+    authorization = websocket.headers.get("authorization", "")
+    ticket = websocket.query_params.get("ticket")
+    try:
+        if ticket and not authorization:
+            principal = await principal_from_ticket(ticket)
+        else:
+            principal = await principal_from_token(
+                authorization.removeprefix("Bearer ")
+            )
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    async with broker.subscribe(principal.id) as queue:
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                await asyncio.wait(
+                    {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected.done():
+                    next_event.cancel()
+                    break
+                await websocket.send_text(next_event.result().model_dump_json())
+        finally:
+            disconnected.cancel()
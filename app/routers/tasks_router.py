@@ -1,79 +1,306 @@
-from typing import Union
+from datetime import timedelta
+from typing import List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import (APIRouter, Depends, File, HTTPException, Query, Request,
+                     UploadFile)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (Float, func, insert, literal, literal_column, select,
+                        tuple_, union_all, update)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.constant import MAX_PAGE_SIZE
-from app.deps import get_current_user, get_db, require_manager
-from app.generic_pagination import paginate_query
-from app.helpers import safe_commit
+from app.conditional import (is_not_modified, listing_validator,
+                             not_modified_response)
+from app.constant import (CHANGES_SAFETY_WINDOW, CONDITIONAL_LISTINGS,
+                          MAX_BULK_SIZE, MAX_PAGE_SIZE)
+from app.database import mark_write, read_engine
+from app.deps import (get_async_db, get_current_principal, get_db, get_read_db,
+                      require_manager)
+from app.events import TASK_CREATED, TASK_UPDATED, broker, task_event
+from app.generic_pagination import (COUNT_CACHED, COUNT_EXACT, COUNT_NONE,
+                                    count_cache, decode_watermark,
+                                    encode_watermark, paginate_cursor,
+                                    paginate_query, paginate_ranked,
+                                    projection, schema_columns)
+from app.helpers import async_safe_commit, insert_row, update_returning
+from app.responses import ModelJSONResponse
+from app.task_export import EXPORT_FORMATS, stream_export
+from app.task_import import (ImportFileError, guess_format, import_tasks,
+                             text_stream)
+from app.task_stats import load_task_stats
+from app.user_cache import get_user_by_id
 
 router = APIRouter(prefix="", tags=["tasks"])
 
+TASK_OUT_COLUMNS = schema_columns(models.Task, schemas.TaskOut)
+
+PAGINATION_DESCRIPTION = "page (offset, default) or cursor (keyset on id)"
+FIELDS_DESCRIPTION = "Comma separated subset of item fields to return"
+COUNT_DESCRIPTION = (
+    "exact, cached (short TTL), estimated (planner estimate on large sets) or "
+    "none; defaults per endpoint in page mode and to none in cursor mode"
+)
+COUNT_PATTERN = "^(exact|cached|estimated|none)$"
+
+
+async def paginate(
+    request: Request,
+    db: AsyncSession,
+    stmt,
+    key,
+    item_schema,
+    pagination: str,
+    page: int,
+    page_size: int,
+    cursor: Union[str, None],
+    count: Union[str, None],
+    with_count: bool,
+    default_count: str,
+):
+    if pagination == "cursor":
+        count = count or (COUNT_EXACT if with_count else COUNT_NONE)
+    else:
+        count = count or default_count
+
+    # Pollers mostly get the same page back: answer 304 before fetching it.
+    # The validator aggregates the whole filtered set, so it only runs where
+    # that count is paid for on every request anyway: page mode with an exact
+    # count. Cached, estimated and none counts exist to avoid it.
+    total = headers = None
+    if CONDITIONAL_LISTINGS and pagination != "cursor" and count == COUNT_EXACT:
+        # the mapped class, or the columns of a subquery (include_archived)
+        source = getattr(key, "class_", None) or key.table.c
+        validator = await listing_validator(request, db, stmt, source)
+        if is_not_modified(request, validator):
+            return not_modified_response(validator)
+        total, headers = validator.count, validator.headers()
+
+    if pagination == "cursor":
+        data = await paginate_cursor(
+            request, db, stmt, key, cursor, page_size, count, total
+        )
+        response_type = schemas.CursorPaginatedResponse[item_schema]
+    else:
+        data = await paginate_query(request, db, stmt, page, page_size, count, total)
+        response_type = schemas.PaginatedResponse[item_schema]
+    return ModelJSONResponse(response_type, data, headers=headers)
+
+
+def owner_column(user, model=models.Task):
+    """Workers see tasks assigned to them, managers the tasks they assigned."""
+    if user.role == models.UserRole.worker:
+        return model.assigned_to
+    return model.assigned_by
+
+
+def with_archived(stmt, user, status):
+    """``stmt`` over live tasks, extended with the user's archived tasks.
+
+    Both sides select the same columns (plus the timestamps the listing
+    validator needs) and are merged with ``UNION ALL``; the outer query keeps
+    the id order, so page and cursor pagination work unchanged. Returns the new
+    statement and its key column.
+    """
+    names = [column.key for column in stmt.selected_columns]
+    names += [name for name in ("created_at", "updated_at") if name not in names]
+    archived = models.ArchivedTask
+    archived_stmt = select(*(getattr(archived, name) for name in names)).where(
+        owner_column(user, archived) == user.id
+    )
+    if status in {s.value for s in models.TaskStatus}:
+        archived_stmt = archived_stmt.where(archived.status == status)
+    live_stmt = stmt.with_only_columns(
+        *(getattr(models.Task, name) for name in names)
+    ).order_by(None)
+    tasks = union_all(live_stmt, archived_stmt).subquery("tasks")
+    item_names = [column.key for column in stmt.selected_columns]
+    return (
+        select(*(tasks.c[name] for name in item_names)).order_by(tasks.c.id),
+        tasks.c.id,
+    )
+
 
 # ----------------- Endpoints -----------------
-@router.get("/workers/", response_model=schemas.PaginatedResponse[schemas.UserOut])
-def list_workers(
+@router.get(
+    "/workers/",
+    response_model=Union[
+        schemas.PaginatedResponse[schemas.UserOut],
+        schemas.CursorPaginatedResponse[schemas.UserOut],
+    ],
+)
+async def list_workers(
     request: Request,
     page: int = 1,
     page_size: int = Query(10, le=MAX_PAGE_SIZE),
-    db: Session = Depends(get_db),
+    pagination: str = Query(
+        "page", pattern="^(page|cursor)$", description=PAGINATION_DESCRIPTION
+    ),
+    cursor: Union[str, None] = Query(None),
+    count: Union[str, None] = Query(
+        None, pattern=COUNT_PATTERN, description=COUNT_DESCRIPTION
+    ),
+    with_count: bool = Query(False, description="Include total count (cursor mode)"),
+    fields: Union[str, None] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
     manager=Depends(require_manager),
 ):
-    q = (
-        db.query(models.User)
-        .filter(models.User.role == "worker")
+    columns, item_schema = projection(models.User, schemas.UserOut, fields)
+    stmt = (
+        select(*columns)
+        .where(models.User.role == models.UserRole.worker)
         .order_by(models.User.id)
     )
-    return paginate_query(request, q, page, page_size)
+    return await paginate(
+        request,
+        db,
+        stmt,
+        models.User.id,
+        item_schema,
+        pagination,
+        page,
+        page_size,
+        cursor,
+        count,
+        with_count,
+        COUNT_EXACT,
+    )
 
 
 @router.post("/tasks/", response_model=schemas.TaskOut)
-def create_task(
+async def create_task(
     task_in: schemas.TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     manager=Depends(require_manager),
 ):
-    worker = (
-        db.query(models.User)
-        .filter(models.User.id == task_in.assigned_to, models.User.role == "worker")
-        .first()
-    )
-    if not worker:
+    worker = await get_user_by_id(db, task_in.assigned_to)
+    if not worker or worker.role != models.UserRole.worker:
         raise HTTPException(status_code=400, detail="Worker not found")
-    task = models.Task(
-        title=task_in.title,
-        description=task_in.description,
-        status="pending",
-        assigned_to=task_in.assigned_to,
-        assigned_by=manager.id,
+    task = await insert_row(
+        db,
+        models.Task,
+        {
+            "title": task_in.title,
+            "description": task_in.description,
+            "status": models.TaskStatus.pending,
+            "assigned_to": task_in.assigned_to,
+            "assigned_by": manager.id,
+        },
+        *TASK_OUT_COLUMNS,
     )
-    db.add(task)
-    safe_commit(db)
-    db.refresh(task)
+    await async_safe_commit(db)
+    count_cache.invalidate()
+    mark_write(manager.id)
+    await broker.publish(task_event(TASK_CREATED, task))
     return task
 
 
-@router.get("/tasks/my", response_model=schemas.PaginatedResponse[schemas.TaskOut])
-def my_tasks(
+@router.post("/tasks/bulk", response_model=schemas.TaskBulkCreateOut)
+async def create_tasks_bulk(
+    tasks_in: List[schemas.TaskCreate],
+    db: AsyncSession = Depends(get_async_db),
+    manager=Depends(require_manager),
+):
+    if len(tasks_in) > MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BULK_SIZE} tasks per request"
+        )
+    worker_ids = {task_in.assigned_to for task_in in tasks_in}
+    result = await db.execute(
+        select(models.User.id).where(
+            models.User.id.in_(worker_ids),
+            models.User.role == models.UserRole.worker,
+        )
+    )
+    valid_worker_ids = set(result.scalars().all())
+
+    rows, errors = [], []
+    for index, task_in in enumerate(tasks_in):
+        if task_in.assigned_to not in valid_worker_ids:
+            errors.append({"index": index, "detail": "Worker not found"})
+            continue
+        rows.append(
+            {
+                "title": task_in.title,
+                "description": task_in.description,
+                "status": models.TaskStatus.pending,
+                "assigned_to": task_in.assigned_to,
+                "assigned_by": manager.id,
+            }
+        )
+
+    created = []
+    if rows:
+        result = await db.execute(
+            insert(models.Task).values(rows).returning(*TASK_OUT_COLUMNS)
+        )
+        created = result.all()
+        await async_safe_commit(db)
+        count_cache.invalidate()
+        mark_write(manager.id)
+        await broker.publish(*(task_event(TASK_CREATED, task) for task in created))
+    return {"created": created, "errors": errors}
+
+
+@router.post("/tasks/import", response_model=schemas.TaskImportOut)
+def import_tasks_file(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    format: Union[str, None] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    manager=Depends(require_manager),
+):
+    """Load tasks (title, description, assigned_to) from a file via COPY.
+
+    Runs in the threadpool on a sync session: ``copy_expert`` is psycopg2 API.
+    """
+    fmt = format or guess_format(file.filename or "")
+    try:
+        summary = import_tasks(db, text_stream(file.file), fmt, manager.id)
+    except (ImportFileError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    count_cache.invalidate()
+    mark_write(manager.id)
+    return summary
+
+
+@router.get(
+    "/tasks/my",
+    response_model=Union[
+        schemas.PaginatedResponse[schemas.TaskOut],
+        schemas.CursorPaginatedResponse[schemas.TaskOut],
+    ],
+)
+async def my_tasks(
     request: Request,
     page: int = 1,
     page_size: int = Query(10, le=MAX_PAGE_SIZE),
     status: Union[str, None] = Query(None, description="pending/in_progress/completed"),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    pagination: str = Query(
+        "page", pattern="^(page|cursor)$", description=PAGINATION_DESCRIPTION
+    ),
+    cursor: Union[str, None] = Query(None),
+    count: Union[str, None] = Query(
+        None, pattern=COUNT_PATTERN, description=COUNT_DESCRIPTION
+    ),
+    with_count: bool = Query(False, description="Include total count (cursor mode)"),
+    fields: Union[str, None] = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(
+        False, description="Also list completed tasks moved to the archive"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal),
 ):
-    if current_user.role == "worker":
-        q = (
-            db.query(models.Task)
-            .filter(models.Task.assigned_to == current_user.id)
+    columns, item_schema = projection(models.Task, schemas.TaskOut, fields)
+    if current_user.role == models.UserRole.worker:
+        stmt = (
+            select(*columns)
+            .where(models.Task.assigned_to == current_user.id)
             .order_by(models.Task.id)
         )
     else:
-        q = (
-            db.query(models.Task)
-            .filter(models.Task.assigned_by == current_user.id)
+        stmt = (
+            select(*columns)
+            .where(models.Task.assigned_by == current_user.id)
             .order_by(models.Task.id)
         )
     if status and status in (
@@ -81,26 +308,234 @@ def my_tasks(
         models.TaskStatus.in_progress.value,
         models.TaskStatus.completed.value,
     ):
-        q = q.filter(models.Task.status == status)
-    return paginate_query(request, q, page, page_size)
+        stmt = stmt.where(models.Task.status == status)
+    key = models.Task.id
+    if include_archived:
+        stmt, key = with_archived(stmt, current_user, status)
+    return await paginate(
+        request,
+        db,
+        stmt,
+        key,
+        item_schema,
+        pagination,
+        page,
+        page_size,
+        cursor,
+        count,
+        with_count,
+        COUNT_CACHED,
+    )
+
+
+@router.get("/tasks/changes", response_model=schemas.TaskChangesOut)
+async def task_changes(
+    since: Union[str, None] = Query(
+        None, description="Watermark from the previous response; omit to start over"
+    ),
+    page_size: int = Query(MAX_PAGE_SIZE, le=MAX_PAGE_SIZE),
+    # on the primary: a lagging replica would move the watermark past changes
+    # it has not replayed yet, and the client would never see them
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_principal),
+):
+    """Tasks created or updated after ``since``, oldest change first.
+
+    Keyset on ``(coalesce(updated_at, created_at), id)``. Timestamps are taken
+    at transaction start, so a write can commit with a time just behind the
+    newest row already seen; the watermark therefore stays at least
+    ``CHANGES_SAFETY_WINDOW`` seconds behind the database clock. A page that
+    reaches into that window ends the sync, and the changes in it are sent
+    again on the next one (clients upsert by id); past the first page, they
+    come through once they leave the window.
+    """
+    changed_at = func.coalesce(models.Task.updated_at, models.Task.created_at)
+    stmt = select(
+        *TASK_OUT_COLUMNS,
+        changed_at.label("changed_at"),
+        func.statement_timestamp().label("db_now"),
+    ).where(owner_column(current_user) == current_user.id)
+    if since is not None:
+        mark_at, mark_id = decode_watermark(since)
+        stmt = stmt.where(
+            tuple_(changed_at, models.Task.id)
+            > tuple_(literal(mark_at, changed_at.type), mark_id)
+        )
+
+    result = await db.execute(
+        stmt.order_by(changed_at, models.Task.id).limit(page_size + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    watermark = since
+    if rows:
+        last = rows[-1]
+        mark = (last.changed_at, last.id)
+        cutoff = (last.db_now - timedelta(seconds=CHANGES_SAFETY_WINDOW), 0)
+        if mark > cutoff:
+            # paging on from the cutoff would return this page again
+            previous = decode_watermark(since) if since is not None else None
+            mark = max(previous, cutoff) if previous is not None else cutoff
+            has_more = False
+        watermark = encode_watermark(*mark)
+    return ModelJSONResponse(
+        schemas.TaskChangesOut,
+        {"results": rows, "watermark": watermark, "has_more": has_more},
+    )
+
+
+@router.get(
+    "/tasks/search",
+    response_model=schemas.CursorPaginatedResponse[schemas.TaskSearchResult],
+)
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    page_size: int = Query(10, le=MAX_PAGE_SIZE),
+    cursor: Union[str, None] = Query(None),
+    include_archived: bool = Query(True, description="Also search archived tasks"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal),
+):
+    """Full-text search over title (weighted higher) and description.
+
+    Matches come from the GIN indexes on ``search_vector`` of ``tasks`` (and
+    ``archived_tasks``); results are ordered by relevance, then id, and paged
+    with a keyset cursor.
+    """
+    query = func.websearch_to_tsquery(
+        literal_column(f"'{models.SEARCH_CONFIG}'::regconfig"), q
+    )
+
+    def matches(model):
+        rank = func.ts_rank_cd(model.search_vector, query, type_=Float)
+        columns = (getattr(model, column.key) for column in TASK_OUT_COLUMNS)
+        stmt = select(*columns, rank.label("rank")).where(
+            model.search_vector.op("@@")(query),
+            owner_column(current_user, model) == current_user.id,
+        )
+        return stmt, rank
+
+    stmt, rank = matches(models.Task)
+    key = models.Task.id
+    if include_archived:
+        archived_stmt, _ = matches(models.ArchivedTask)
+        tasks = union_all(stmt, archived_stmt).subquery("tasks")
+        stmt, rank, key = select(*tasks.c), tasks.c.rank, tasks.c.id
+    data = await paginate_ranked(request, db, stmt, rank, key, cursor, page_size)
+    return ModelJSONResponse(
+        schemas.CursorPaginatedResponse[schemas.TaskSearchResult], data
+    )
+
+
+@router.get("/tasks/export", response_class=StreamingResponse)
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Union[str, None] = Query(None, description="pending/in_progress/completed"),
+    include_archived: bool = Query(True, description="Also export archived tasks"),
+    current_user=Depends(get_current_principal),
+):
+    """Every task visible to the caller, streamed in id order."""
+    stmt = (
+        select(*TASK_OUT_COLUMNS)
+        .where(owner_column(current_user) == current_user.id)
+        .order_by(models.Task.id)
+    )
+    if status in {s.value for s in models.TaskStatus}:
+        stmt = stmt.where(models.Task.status == status)
+    if include_archived:
+        stmt, _ = with_archived(stmt, current_user, status)
+    media_type, filename = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        stream_export(stmt, format, read_engine(current_user.id)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/tasks/stats", response_model=schemas.TaskStatsOut)
+async def task_stats(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal),
+):
+    # Managers get one row per worker they assigned to, workers their own row
+    return {"workers": await load_task_stats(db, current_user)}
+
+
+@router.patch("/tasks/status", response_model=schemas.TaskBulkStatusOut)
+async def update_status_bulk(
+    status_in: schemas.TaskBulkStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_principal),
+):
+    if status_in.status not in ("pending", "in_progress", "completed"):
+        raise HTTPException(status_code=400, detail="Invalid status")
+    task_ids = list(dict.fromkeys(status_in.task_ids))
+    if len(task_ids) > MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BULK_SIZE} tasks per request"
+        )
+
+    stmt = update(models.Task).where(models.Task.id.in_(task_ids))
+    if user.role == models.UserRole.worker:
+        stmt = stmt.where(models.Task.assigned_to == user.id)
+    result = await db.execute(
+        stmt.values(status=status_in.status)
+        .returning(*TASK_OUT_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    updated = {row.id: row for row in result.all()}
+    await async_safe_commit(db)
+    count_cache.invalidate()
+    mark_write(user.id)
+    await broker.publish(*(task_event(TASK_UPDATED, task) for task in updated.values()))
+
+    # Only tell "not allowed" from "not found" when something was skipped
+    missing = [task_id for task_id in task_ids if task_id not in updated]
+    existing = set()
+    if missing:
+        result = await db.execute(
+            select(models.Task.id).where(models.Task.id.in_(missing))
+        )
+        existing = set(result.scalars().all())
+
+    results = []
+    for task_id in task_ids:
+        if task_id in updated:
+            results.append({"id": task_id, "ok": True, "task": updated[task_id]})
+        elif task_id in existing:
+            results.append({"id": task_id, "ok": False, "detail": "Not allowed"})
+        else:
+            results.append({"id": task_id, "ok": False, "detail": "Task not found"})
+    return {"results": results}
 
 
 @router.patch("/tasks/{task_id}/status", response_model=schemas.TaskOut)
-def update_status(
+async def update_status(
     task_id: int,
     status_in: schemas.TaskStatusUpdate,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_principal),
 ):
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if user.role == "worker" and task.assigned_to != user.id:
-        raise HTTPException(status_code=403, detail="Not allowed")
     if status_in.status not in ("pending", "in_progress", "completed"):
         raise HTTPException(status_code=400, detail="Invalid status")
-    task.status = status_in.status
-    db.add(task)
-    safe_commit(db)
-    db.refresh(task)
-    return task
+    stmt = update(models.Task).where(models.Task.id == task_id)
+    if user.role == models.UserRole.worker:
+        stmt = stmt.where(models.Task.assigned_to == user.id)
+    task = await update_returning(
+        db, stmt.values(status=status_in.status), *TASK_OUT_COLUMNS
+    )
+    if task:
+        await async_safe_commit(db)
+        count_cache.invalidate()
+        mark_write(user.id)
+        await broker.publish(task_event(TASK_UPDATED, task))
+        return task
+
+    # Nothing updated: tell a missing task from someone else's
+    result = await db.execute(select(models.Task.id).where(models.Task.id == task_id))
+    if result.scalar() is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    raise HTTPException(status_code=403, detail="Not allowed")
@@ -1,7 +1,8 @@
 from typing import Generic, List, Optional, TypeVar
 
-from pydantic import BaseModel
-from pydantic.generics import GenericModel
+from pydantic import BaseModel, ConfigDict
+
+from app.models import UserRole
 
 
 # --- Auth ---
@@ -10,9 +11,32 @@ class Token(BaseModel):
     token_type: str
 
 
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int  # seconds
+
+
 class TokenData(BaseModel):
     user_id: Optional[int]
     role: Optional[str]
+    token_version: Optional[int] = None
+
+
+class Principal(BaseModel):
+    """Authenticated caller as seen by the role-gated endpoints."""
+
+    id: int
+    role: UserRole
+
+
+class CachedUser(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int
+    mobile: str
+    password_hash: str
+    role: UserRole
+    token_version: int
 
 
 class UserCreate(BaseModel):
@@ -22,13 +46,12 @@ class UserCreate(BaseModel):
 
 
 class UserOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     mobile: str
     role: str
 
-    class Config:
-        orm_mode = True
-
 
 # --- Tasks ---
 class TaskCreate(BaseModel):
@@ -38,6 +61,8 @@ class TaskCreate(BaseModel):
 
 
 class TaskOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     title: str
     description: Optional[str]
@@ -45,22 +70,95 @@ class TaskOut(BaseModel):
     assigned_to: int
     assigned_by: int
 
-    class Config:
-        orm_mode = True
+
+class TaskSearchResult(TaskOut):
+    rank: float
+
+
+class TaskEvent(BaseModel):
+    type: str  # task.created | task.updated
+    task: TaskOut
+
+
+class TaskChangesOut(BaseModel):
+    results: List[TaskOut]
+    watermark: Optional[str]  # pass back as ?since= on the next sync
+    has_more: bool
+
+
+class WorkerTaskStats(BaseModel):
+    worker_id: int
+    pending: int
+    in_progress: int
+    completed: int
+    total: int
+
+
+class TaskStatsOut(BaseModel):
+    workers: List[WorkerTaskStats]
 
 
 class TaskStatusUpdate(BaseModel):
     status: str  # pending | in_progress | completed
 
 
+class TaskBulkStatusUpdate(BaseModel):
+    task_ids: List[int]
+    status: str  # pending | in_progress | completed
+
+
+class TaskStatusResult(BaseModel):
+    id: int
+    ok: bool
+    detail: Optional[str] = None
+    task: Optional[TaskOut] = None
+
+
+class TaskBulkStatusOut(BaseModel):
+    results: List[TaskStatusResult]
+
+
+class BulkItemError(BaseModel):
+    index: int  # position in the request list
+    detail: str
+
+
+class TaskBulkCreateOut(BaseModel):
+    created: List[TaskOut]
+    errors: List[BulkItemError]
+
+
+class ImportRowError(BaseModel):
+    line: int  # line number in the uploaded file
+    detail: str
+
+
+class TaskImportOut(BaseModel):
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]  # first IMPORT_MAX_REPORTED_ERRORS rejections
+
+
 # --- Pagination response ---
 T = TypeVar("T")
 
 
-class PaginatedResponse(GenericModel, Generic[T]):
-    count: int
+class PaginatedResponse(BaseModel, Generic[T]):
+    model_config = ConfigDict(from_attributes=True)
+
+    count: Optional[int]
     page: int
     page_size: int
     next: Optional[str]
     previous: Optional[str]
     results: List[T]
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    model_config = ConfigDict(from_attributes=True)
+
+    count: Optional[int]
+    page_size: int
+    next: Optional[str]
+    previous: Optional[str]
+    results: List[T]
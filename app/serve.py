@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+
+import uvicorn
+
+from app import constant
+from app.constant import (DB_CONNECTION_BUDGET, DB_MAX_OVERFLOW, DB_POOL_SIZE,
+                          EVENTS_BACKEND, GRACEFUL_SHUTDOWN_TIMEOUT, HOST,
+                          PORT, WEB_CONCURRENCY)
+
+# Production entry point: python -m app.serve [--workers N] [--port 8000]
+#
+# The app is passed to uvicorn as an import string and nothing here touches
+# app.database, so each worker builds its own engines after it starts; a
+# process forked after the pools exist starts with empty ones (app.database).
+
+# Connections each process holds to the primary besides its two pools
+# (sync and async): the LISTEN connection of the postgres events backend.
+EXTRA_CONNECTIONS = 1 if EVENTS_BACKEND == "postgres" else 0
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on (respects taskset/cgroup cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def pool_sizes(budget: int, workers: int):
+    """``(pool_size, max_overflow)`` per engine so all workers fit in ``budget``.
+
+    Every worker has a sync and an async engine on the primary; each engine's
+    share is split a third pool, two thirds overflow, like the 10 + 20 defaults.
+    Replicas get the same sizes, the budget only accounts for the primary.
+    """
+    per_engine = (budget // workers - EXTRA_CONNECTIONS) // 2
+    if per_engine < 1:
+        raise ValueError(
+            f"DB_CONNECTION_BUDGET={budget} is too small for {workers} workers"
+        )
+    pool_size = max(1, per_engine // 3)
+    return pool_size, per_engine - pool_size
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with uvicorn")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument(
+        "--workers", type=int, default=WEB_CONCURRENCY, help="0: one per CPU"
+    )
+    parser.add_argument(
+        "--db-budget",
+        type=int,
+        default=DB_CONNECTION_BUDGET,
+        help="total primary connections across workers, 0: no limit",
+    )
+    args = parser.parse_args(argv)
+
+    workers = args.workers or cpu_count()
+    pool_size, max_overflow = DB_POOL_SIZE, DB_MAX_OVERFLOW
+    if args.db_budget:
+        try:
+            pool_size, max_overflow = pool_sizes(args.db_budget, workers)
+        except ValueError as exc:
+            sys.exit(str(exc))
+    # Spawned workers re-read app.constant from the environment. A single
+    # worker runs in this process, where app.constant is already loaded but
+    # app.database (which builds the engines from it) is not yet.
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    constant.DB_POOL_SIZE, constant.DB_MAX_OVERFLOW = pool_size, max_overflow
+    print(
+        f"Starting {workers} worker(s), pool_size={pool_size} "
+        f"max_overflow={max_overflow} per engine",
+        file=sys.stderr,
+    )
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        # SIGTERM: stop accepting, let in-flight requests finish, then cancel
+        # whatever is left (e.g. open event streams) after the timeout
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.constant import (ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE,
+                          ARCHIVE_INTERVAL)
+from app.database import async_engine
+from app.generic_pagination import count_cache
+
+logger = logging.getLogger(__name__)
+
+# One batch: delete the oldest completed tasks and insert them into
+# archived_tasks in the same statement. SKIP LOCKED lets several processes
+# archive at once, and leaves rows that are being updated for the next run.
+# The status counters have no delete trigger, so archived tasks keep counting.
+ARCHIVE_BATCH = text(
+    """
+    WITH moved AS (
+        DELETE FROM tasks
+        WHERE id IN (
+            SELECT id FROM tasks
+            WHERE status = 'completed'
+              AND coalesce(updated_at, created_at)
+                  < now() - make_interval(days => :days)
+            ORDER BY coalesce(updated_at, created_at)
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, title, description, status, assigned_to, assigned_by,
+                  created_at, updated_at
+    )
+    INSERT INTO archived_tasks (id, title, description, status, assigned_to,
+                                assigned_by, created_at, updated_at)
+    SELECT id, title, description, status, assigned_to, assigned_by,
+           created_at, updated_at
+    FROM moved
+    """
+)
+
+
+# ---------------- Mover ----------------
+async def archive_completed(
+    engine: AsyncEngine,
+    days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> int:
+    """Move completed tasks unchanged for ``days`` to ``archived_tasks``.
+
+    Each batch is its own short transaction, so row locks are held briefly and
+    an interrupted run keeps what it already moved. Returns the number moved.
+    """
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                ARCHIVE_BATCH, {"days": days, "batch_size": batch_size}
+            )
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    if total:
+        count_cache.invalidate()
+    return total
+
+
+class Archiver:
+    """Runs ``archive_completed`` every ``interval`` seconds inside the app."""
+
+    def __init__(self, interval: int = ARCHIVE_INTERVAL):
+        self.interval = interval
+        self._task = None
+
+    async def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                moved = await archive_completed(async_engine)
+            except Exception:
+                logger.exception("Archiving completed tasks failed")
+                continue
+            if moved:
+                logger.info("Archived %d completed task(s)", moved)
+
+
+archiver = Archiver()
+
+
+# ---------------- Command ----------------
+# python -m app.task_archive [--days 30] [--batch-size 1000]
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Archive completed tasks")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    async def run() -> int:
+        try:
+            return await archive_completed(async_engine, args.days, args.batch_size)
+        finally:
+            await async_engine.dispose()
+
+    print(f"Archived {asyncio.run(run())} completed task(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import csv
+import io
+from typing import AsyncIterator, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import Select
+
+from app import schemas
+from app.constant import EXPORT_CHUNK_SIZE
+from app.database import async_engine
+from app.responses import type_adapter
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "tasks.ndjson"),
+    "csv": ("text/csv; charset=utf-8", "tasks.csv"),
+}
+
+
+def _ndjson_chunk(tasks: List[schemas.TaskOut]) -> bytes:
+    adapter = type_adapter(schemas.TaskOut)
+    return b"".join(adapter.dump_json(task) + b"\n" for task in tasks)
+
+
+def _csv_rows(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_chunk(tasks: List[schemas.TaskOut]) -> bytes:
+    return _csv_rows(task.model_dump().values() for task in tasks)
+
+
+_FORMATTERS = {"ndjson": _ndjson_chunk, "csv": _csv_chunk}
+
+
+async def stream_export(
+    stmt: Select, fmt: str, engine: AsyncEngine = async_engine
+) -> AsyncIterator[bytes]:
+    """Encode every row of ``stmt`` in ``fmt``, ``EXPORT_CHUNK_SIZE`` rows at a time.
+
+    Rows come from a server-side cursor on a connection owned by the generator
+    (the request's session is gone once the response starts streaming), so
+    memory stays flat however many rows there are.
+    """
+    formatter = _FORMATTERS[fmt]
+    rows_adapter = type_adapter(List[schemas.TaskOut])
+    if fmt == "csv":
+        yield _csv_rows([schemas.TaskOut.model_fields])
+    async with engine.connect() as conn:
+        result = await conn.stream(stmt)
+        async for rows in result.partitions(EXPORT_CHUNK_SIZE):
+            yield formatter(rows_adapter.validate_python(rows, from_attributes=True))
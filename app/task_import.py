@@ -0,0 +1,235 @@
+import argparse
+import csv
+import io
+import json
+import sys
+import tempfile
+from typing import IO, Any, Iterator, Optional, Tuple
+
+from sqlalchemy import column, insert, literal, select, table, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.constant import IMPORT_MAX_REPORTED_ERRORS
+from app.helpers import safe_commit
+
+# Rows are COPYed into this per-transaction table, checked and moved into
+# tasks with a single INSERT ... SELECT.
+STAGING_DDL = """
+CREATE TEMPORARY TABLE task_import (
+    line integer NOT NULL,
+    title text NOT NULL,
+    description text,
+    assigned_to integer NOT NULL
+) ON COMMIT DROP
+"""
+staging = table(
+    "task_import",
+    column("line"),
+    column("title"),
+    column("description"),
+    column("assigned_to"),
+)
+
+
+# assigned_to is an integer column
+MAX_USER_ID = 2**31 - 1
+
+
+class ImportFileError(ValueError):
+    """The upload as a whole cannot be read (e.g. no usable CSV header)."""
+
+
+# ---------------- Parsing ----------------
+# Readers yield (line number, title, description, assigned_to), or
+# (line number, None, None, None) for a row that cannot be parsed at all.
+def _csv_records(stream: IO[str]) -> Iterator[Tuple[int, Any, Any, Any]]:
+    reader = csv.reader(stream)
+    header = next(reader, None) or []
+    if "title" not in header or "assigned_to" not in header:
+        raise ImportFileError("CSV header must include title and assigned_to")
+    title, assigned_to = header.index("title"), header.index("assigned_to")
+    description = header.index("description") if "description" in header else None
+    width = len(header)
+    for row in reader:
+        if len(row) != width:
+            yield reader.line_num, None, None, None
+            continue
+        yield (
+            reader.line_num,
+            row[title],
+            row[description] if description is not None else None,
+            row[assigned_to],
+        )
+
+
+def _ndjson_records(stream: IO[str]) -> Iterator[Tuple[int, Any, Any, Any]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            yield line_number, None, None, None
+            continue
+        yield (
+            line_number,
+            record.get("title"),
+            record.get("description"),
+            record.get("assigned_to"),
+        )
+
+
+READERS = {"csv": _csv_records, "ndjson": _ndjson_records}
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
+
+
+def guess_format(filename: str) -> str:
+    return "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, line: int, detail: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    def summary(self) -> dict:
+        return {
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+        }
+
+
+def _user_id(value: Any) -> Optional[int]:
+    """``value`` as a user id, or None unless it is a whole number in range.
+
+    CSV gives strings of ASCII digits; NDJSON may also give JSON integers, but
+    not floats (``3.9``) or booleans (``true`` is an ``int`` in Python).
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if not (value.isascii() and value.isdigit()):
+            return None
+        value = int(value)
+    elif isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value if 0 < value <= MAX_USER_ID else None
+
+
+def _copy_buffer(stream: IO[str], fmt: str, result: ImportResult) -> IO[str]:
+    """Validate row shapes and re-encode the accepted ones as COPY CSV."""
+    buffer = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+")
+    writer = csv.writer(buffer)
+    for line, title, description, assigned_to in READERS[fmt](stream):
+        if title is None and assigned_to is None:
+            result.reject(line, "Malformed row")
+            continue
+        if not isinstance(title, str) or not title.strip():
+            result.reject(line, "Missing title")
+            continue
+        assigned_to = _user_id(assigned_to)
+        if assigned_to is None:
+            result.reject(line, "Invalid assigned_to")
+            continue
+        writer.writerow((line, title, description or None, assigned_to))
+    buffer.seek(0)
+    return buffer
+
+
+# ---------------- Import ----------------
+def import_tasks(db: Session, stream: IO[str], fmt: str, manager_id: int) -> dict:
+    """Load tasks from a CSV (with header) or NDJSON stream in one transaction.
+
+    Accepted rows are streamed into a temporary table with ``COPY FROM STDIN``;
+    worker ids are checked with one set-based query, and the valid rows are
+    moved into ``tasks`` with one ``INSERT ... SELECT``. Returns a summary with
+    the first ``IMPORT_MAX_REPORTED_ERRORS`` rejected rows.
+    """
+    result = ImportResult()
+    buffer = _copy_buffer(stream, fmt, result)
+
+    db.execute(text(STAGING_DDL))
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY task_import (line, title, description, assigned_to) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+        buffer.close()
+
+    is_worker = (models.User.id == staging.c.assigned_to) & (
+        models.User.role == models.UserRole.worker
+    )
+    unknown = db.execute(
+        select(staging.c.line)
+        .where(~select(models.User.id).where(is_worker).exists())
+        .order_by(staging.c.line)
+    )
+    for (line,) in unknown:
+        result.reject(line, "Worker not found")
+
+    inserted = db.execute(
+        insert(models.Task).from_select(
+            ["title", "description", "status", "assigned_to", "assigned_by"],
+            select(
+                staging.c.title,
+                staging.c.description,
+                literal(models.TaskStatus.pending, models.Task.status.type),
+                staging.c.assigned_to,
+                literal(manager_id),
+            )
+            .select_from(staging.join(models.User, is_worker))
+            .order_by(staging.c.line),
+        )
+    )
+    result.imported = inserted.rowcount
+    safe_commit(db)
+    return result.summary()
+
+
+# ---------------- Command ----------------
+# python -m app.task_import tasks.csv --manager 1 [--format ndjson]
+def main(argv=None) -> None:
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk import tasks")
+    parser.add_argument("path", help="CSV (with header) or NDJSON file, - for stdin")
+    parser.add_argument("--manager", type=int, required=True, help="assigned_by id")
+    parser.add_argument("--format", choices=sorted(READERS))
+    args = parser.parse_args(argv)
+
+    fmt = args.format or guess_format(args.path)
+    stream = (
+        sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8")
+    )
+    db = SessionLocal()
+    try:
+        manager = db.get(models.User, args.manager)
+        if manager is None or manager.role != models.UserRole.manager:
+            sys.exit(f"User {args.manager} is not a manager")
+        summary = import_tasks(db, stream, fmt, args.manager)
+    except ImportFileError as exc:
+        sys.exit(str(exc))
+    finally:
+        db.close()
+        stream.close()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
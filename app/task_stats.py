@@ -0,0 +1,97 @@
+import sys
+
+from sqlalchemy import delete, func, insert, select, text, union_all
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+
+Counts = models.TaskStatusCount
+
+
+# ---------------- Dashboard Query ----------------
+async def load_task_stats(db: AsyncSession, principal: schemas.Principal) -> list:
+    """Per-worker status counts read from the counters table, O(workers)."""
+    if principal.role == models.UserRole.worker:
+        condition = Counts.assigned_to == principal.id
+    else:
+        condition = Counts.assigned_by == principal.id
+    result = await db.execute(
+        select(Counts.assigned_to, Counts.status, func.sum(Counts.count))
+        .where(condition)
+        .group_by(Counts.assigned_to, Counts.status)
+        .order_by(Counts.assigned_to)
+    )
+
+    workers = {}
+    for worker_id, status, count in result.all():
+        stats = workers.setdefault(
+            worker_id,
+            {"worker_id": worker_id, **{s.value: 0 for s in models.TaskStatus}},
+        )
+        stats[status.value] += count
+    for stats in workers.values():
+        stats["total"] = sum(stats[s.value] for s in models.TaskStatus)
+    return list(workers.values())
+
+
+# ---------------- Reconciliation ----------------
+def reconcile(conn: Connection) -> int:
+    """Rebuild the counters from ``tasks`` and ``archived_tasks``.
+
+    Returns how many had drifted. Task writers and the archiver are blocked
+    (``SHARE`` lock) until the surrounding transaction commits, so no trigger
+    update or archived batch can interleave with the rebuild.
+    """
+    conn.execute(text("LOCK TABLE tasks, archived_tasks IN SHARE MODE"))
+    key = (Counts.assigned_by, Counts.assigned_to, Counts.status)
+    stored = {
+        tuple(row[:3]): row[3] for row in conn.execute(select(*key, Counts.count))
+    }
+    tasks = union_all(
+        *(
+            select(model.assigned_by, model.assigned_to, model.status)
+            for model in (models.Task, models.ArchivedTask)
+        )
+    ).subquery()
+    actual = {
+        tuple(row[:3]): row[3]
+        for row in conn.execute(select(*tasks.c, func.count()).group_by(*tasks.c))
+    }
+
+    conn.execute(delete(Counts))
+    if actual:
+        conn.execute(
+            insert(Counts),
+            [
+                {
+                    "assigned_by": assigned_by,
+                    "assigned_to": assigned_to,
+                    "status": status,
+                    "count": count,
+                }
+                for (assigned_by, assigned_to, status), count in actual.items()
+            ],
+        )
+    return sum(
+        1
+        for counter in stored.keys() | actual.keys()
+        if stored.get(counter, 0) != actual.get(counter, 0)
+    )
+
+
+# ---------------- Command ----------------
+# python -m app.task_stats reconcile
+def main(argv=None) -> None:
+    from app.database import engine
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["reconcile"]:
+        sys.exit("usage: python -m app.task_stats reconcile")
+    with engine.begin() as conn:
+        drifted = reconcile(conn)
+    print(f"Task status counters rebuilt ({drifted} had drifted)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import metrics, models, schemas
+from app.constant import USER_CACHE_SIZE, USER_CACHE_TTL
+
+
+class UserCache:
+    """Bounded LRU + TTL cache of user rows, addressable by id and by mobile.
+
+    Entries are immutable ``schemas.CachedUser`` snapshots, so they can be shared
+    across sessions and requests. Writers must call ``invalidate`` after changing
+    a user row.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._by_id: "OrderedDict[int, tuple]" = OrderedDict()
+        self._by_mobile: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, user_id: Optional[int]) -> Optional[schemas.CachedUser]:
+        entry = self._by_id.get(user_id) if user_id is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        user, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(user_id)
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._by_id.move_to_end(user_id)
+        self.hits += 1
+        return user
+
+    def _remove(self, user_id: int) -> None:
+        user, _ = self._by_id.pop(user_id)
+        if self._by_mobile.get(user.mobile) == user_id:
+            del self._by_mobile[user.mobile]
+
+    def get(self, user_id: int) -> Optional[schemas.CachedUser]:
+        with self._lock:
+            return self._lookup(user_id)
+
+    def get_by_mobile(self, mobile: str) -> Optional[schemas.CachedUser]:
+        with self._lock:
+            return self._lookup(self._by_mobile.get(mobile))
+
+    def put(self, user: schemas.CachedUser) -> None:
+        with self._lock:
+            if user.id in self._by_id:
+                self._remove(user.id)
+            self._by_id[user.id] = (user, time.monotonic() + self.ttl)
+            self._by_mobile[user.mobile] = user.id
+            while len(self._by_id) > self.maxsize:
+                self._remove(next(iter(self._by_id)))
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if user_id in self._by_id:
+                self._remove(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_id.clear()
+            self._by_mobile.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+for _stat in ("hits", "misses", "evictions"):
+    metrics.callback(
+        f"user_cache_{_stat}_total",
+        f"User cache {_stat}",
+        lambda stat=_stat: {(): user_cache.stats()[stat]},
+        kind="counter",
+    )
+metrics.callback(
+    "user_cache_size",
+    "Users currently cached",
+    lambda: {(): user_cache.stats()["size"]},
+)
+
+
+# ---------------- Loaders ----------------
+async def _load(db: AsyncSession, condition) -> Optional[schemas.CachedUser]:
+    result = await db.execute(select(models.User).where(condition))
+    user = result.scalars().first()
+    if user is None:
+        return None
+    cached = schemas.CachedUser.model_validate(user)
+    user_cache.put(cached)
+    return cached
+
+
+async def load_user_by_id(
+    db: AsyncSession, user_id: int
+) -> Optional[schemas.CachedUser]:
+    return await _load(db, models.User.id == user_id)
+
+
+async def get_user_by_id(
+    db: AsyncSession, user_id: int
+) -> Optional[schemas.CachedUser]:
+    return user_cache.get(user_id) or await load_user_by_id(db, user_id)
+
+
+async def get_user_by_mobile(
+    db: AsyncSession, mobile: str
+) -> Optional[schemas.CachedUser]:
+    return user_cache.get_by_mobile(mobile) or await _load(
+        db, models.User.mobile == mobile
+    )
@@ -0,0 +1,103 @@
+"""Paginated-response serialization benchmark (rows/sec), old path vs new path.
+
+* old: full ``models.Task`` entities in a dict, validated through the
+  ``response_model`` by FastAPI's ``serialize_response`` and rendered by
+  ``JSONResponse``.
+* new: ``TaskOut`` column tuples rendered to bytes by ``ModelJSONResponse``.
+
+No database is needed: rows are built in memory so only serialization is timed.
+
+    python benchmarks/serialization.py [--page-size 100] [--pages 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app import models, schemas  # noqa: E402
+from app.responses import ModelJSONResponse  # noqa: E402
+
+TaskRow = namedtuple(
+    "TaskRow", ["id", "title", "description", "status", "assigned_to", "assigned_by"]
+)
+
+
+def page(results):
+    return {
+        "count": 1_000_000,
+        "page": 2,
+        "page_size": len(results),
+        "next": "http://testserver/tasks/my?page=3&page_size=100",
+        "previous": "http://testserver/tasks/my?page=1&page_size=100",
+        "results": results,
+    }
+
+
+def make_rows(n):
+    return [
+        TaskRow(
+            i,
+            f"Task {i}",
+            "Pick up the order and deliver it to the front desk " * 3,
+            models.TaskStatus.pending,
+            7,
+            3,
+        )
+        for i in range(n)
+    ]
+
+
+def make_entities(n):
+    return [models.Task(**row._asdict()) for row in make_rows(n)]
+
+
+def bench(label, fn, pages, page_size):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(pages):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = pages * page_size / elapsed
+    print(f"{label:<32} {rate:>12,.0f} rows/sec")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    response_type = schemas.PaginatedResponse[schemas.TaskOut]
+    field = create_model_field(name="Response", type_=response_type)
+    entities = page(make_entities(args.page_size))
+    rows = page(make_rows(args.page_size))
+    loop = asyncio.new_event_loop()
+
+    def old_path():
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=entities)
+        )
+        return JSONResponse(content).body
+
+    def new_path():
+        return ModelJSONResponse(response_type, rows).body
+
+    before = bench(
+        "ORM entities + jsonable (old)", old_path, args.pages, args.page_size
+    )
+    after = bench("column rows + pydantic-core", new_path, args.pages, args.page_size)
+    print(f"speed-up: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Startup benchmark: import time of ``app.main`` and time to first request.
+
+Each sample runs in a fresh interpreter so module caches do not leak between
+runs. The first request is driven straight through the ASGI interface (lifespan
+startup followed by ``GET /``), so no server or HTTP client is involved.
+
+    python benchmarks/startup.py [--runs N] [--record]
+
+``--record`` appends the medians to ``benchmarks/startup_history.csv`` so
+regressions show up in review.
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, "benchmarks", "startup_history.csv")
+
+SAMPLE = r"""
+import asyncio, json, time
+
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+
+
+async def first_request():
+    messages = [{"type": "lifespan.startup"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    lifespan = asyncio.ensure_future(
+        app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, send)
+    )
+    while not sent:
+        await asyncio.sleep(0)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+    }
+    done = asyncio.Event()
+
+    async def http_receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def http_send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(scope, http_receive, http_send)
+    await done.wait()
+    lifespan.cancel()
+
+
+asyncio.run(first_request())
+t2 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "first_request_s": t2 - t0}))
+"""
+
+
+def run_sample() -> dict:
+    env = {**os.environ, "DB_CREATE_ALL": os.getenv("DB_CREATE_ALL", "false")}
+    out = subprocess.run(
+        [sys.executable, "-c", SAMPLE],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    samples = [run_sample() for _ in range(args.runs)]
+    import_s = statistics.median(s["import_s"] for s in samples)
+    first_request_s = statistics.median(s["first_request_s"] for s in samples)
+    print(f"import app.main:     {import_s * 1000:8.1f} ms (median of {args.runs})")
+    print(f"time to 1st request: {first_request_s * 1000:8.1f} ms")
+
+    if args.record:
+        new_file = not os.path.exists(HISTORY)
+        with open(HISTORY, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["date", "revision", "import_ms", "first_request_ms"])
+            writer.writerow(
+                [
+                    datetime.now(timezone.utc).date().isoformat(),
+                    git_revision(),
+                    f"{import_s * 1000:.1f}",
+                    f"{first_request_s * 1000:.1f}",
+                ]
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Tests that need Postgres run against the database named by TEST_DB_NAME.
+
+The other DB_* settings (user, password, host, port) are read as usual. Each
+test module starts from an empty ``public`` schema, so never point
+TEST_DB_NAME at a database whose data matters. Without it, or when the server
+cannot be reached, those tests are skipped.
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+
+TEST_DB_NAME = os.getenv("TEST_DB_NAME")
+if TEST_DB_NAME:
+    # before app.constant is first imported
+    os.environ["DB_NAME"] = TEST_DB_NAME
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["ARCHIVE_INTERVAL"] = "0"
+os.environ["DB_REPLICA_URLS"] = ""
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Sync engine on the test database; skips when there is none."""
+    if not TEST_DB_NAME:
+        pytest.skip("TEST_DB_NAME is not set")
+    from sqlalchemy.exc import OperationalError
+
+    from app.database import engine
+
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as exc:
+        pytest.skip(f"test database unavailable: {exc.orig}")
+    return engine
+
+
+@pytest.fixture(scope="module")
+def empty_db(database):
+    """Drop and recreate every table for the module."""
+    from sqlalchemy import text
+
+    from app import models  # noqa: F401 (registers the tables)
+    from app.database import Base
+    from app.generic_pagination import count_cache
+    from app.user_cache import user_cache
+
+    with database.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    Base.metadata.create_all(bind=database)
+    user_cache.clear()
+    count_cache.invalidate()
+    return database
+
+
+@pytest.fixture(scope="module")
+def client(empty_db):
+    from fastapi.testclient import TestClient
+
+    from app.database import async_engine
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+        # pooled connections belong to this client's event loop
+        client.portal.call(async_engine.dispose)
+
+
+@pytest.fixture(scope="module")
+def register(client):
+    """``register(mobile, role)`` -> (auth headers, user id)."""
+
+    def register(mobile: str, role: str):
+        response = client.post(
+            "/auth/register", json={"mobile": mobile, "password": "pw", "role": role}
+        )
+        assert response.status_code == 200, response.text
+        login = client.post("/auth/login", params={"mobile": mobile, "password": "pw"})
+        assert login.status_code == 200, login.text
+        token = login.json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}, response.json()["id"]
+
+    return register
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def before_cursor_execute(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def commit(self, conn):
+        self.commits += 1
+
+
+@pytest.fixture
+def count_sql(client):
+    """``with count_sql() as sql:`` records what the async engine runs."""
+    from sqlalchemy import event
+
+    from app.database import async_engine
+
+    sync_engine = async_engine.sync_engine
+
+    @contextmanager
+    def count_sql():
+        counter = StatementCounter()
+        event.listen(
+            sync_engine, "before_cursor_execute", counter.before_cursor_execute
+        )
+        event.listen(sync_engine, "commit", counter.commit)
+        try:
+            yield counter
+        finally:
+            event.remove(
+                sync_engine, "before_cursor_execute", counter.before_cursor_execute
+            )
+            event.remove(sync_engine, "commit", counter.commit)
+
+    return count_sql
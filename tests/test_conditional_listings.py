@@ -0,0 +1,54 @@
+"""ETags on listings: only where the exact count is paid for anyway."""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def users(register):
+    manager, _ = register("500000001", "manager")
+    worker, worker_id = register("500000002", "worker")
+    return manager, worker, worker_id
+
+
+@pytest.fixture(scope="module")
+def tasks(client, users):
+    manager, _, worker_id = users
+    tasks = [{"title": f"t{i}", "assigned_to": worker_id} for i in range(3)]
+    response = client.post("/tasks/bulk", json=tasks, headers=manager)
+    assert response.status_code == 200, response.text
+    return response.json()["created"]
+
+
+def test_cached_count_skips_validator(client, users, tasks, count_sql):
+    _, worker, _ = users
+    client.get("/tasks/my", headers=worker)  # fills the count cache
+    with count_sql() as sql:
+        response = client.get("/tasks/my", headers=worker)
+    assert response.status_code == 200, response.text
+    assert response.json()["count"] == len(tasks)
+    assert "ETag" not in response.headers
+    assert len(sql.statements) == 1, sql.statements  # the page only
+
+
+def test_exact_count_not_modified(client, users, tasks, count_sql):
+    _, worker, _ = users
+    params = {"count": "exact"}
+    response = client.get("/tasks/my", params=params, headers=worker)
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+
+    with count_sql() as sql:
+        response = client.get(
+            "/tasks/my", params=params, headers={**worker, "If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert len(sql.statements) == 1, sql.statements  # the validator only
+
+    client.patch(
+        f"/tasks/{tasks[0]['id']}/status", json={"status": "completed"}, headers=worker
+    )
+    response = client.get(
+        "/tasks/my", params=params, headers={**worker, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,90 @@
+"""A forked child never talks over the parent's pooled connections."""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import event, text
+
+if not os.getenv("TEST_DB_NAME"):
+    # app.database needs the DB_* settings at import
+    pytest.skip("TEST_DB_NAME is not set", allow_module_level=True)
+
+from app.database import async_engine, engine
+
+BACKEND_PID = text("SELECT pg_backend_pid()")
+
+
+def backend_pids(sql_engine):
+    """Backend pids of the connections ``sql_engine`` checks out (and pings)."""
+    pids = []
+
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        # psycopg2 connection, or asyncpg behind SQLAlchemy's adapter
+        if hasattr(dbapi_connection, "get_backend_pid"):
+            pids.append(dbapi_connection.get_backend_pid())
+        else:
+            pids.append(dbapi_connection._connection.get_server_pid())
+
+    event.listen(sql_engine, "checkout", checkout)
+    return pids
+
+
+async def async_backend_pid() -> int:
+    async with async_engine.connect() as conn:
+        return (await conn.execute(BACKEND_PID)).scalar()
+
+
+def run_in_child(child) -> int:
+    """Run ``child()`` in a forked process; returns what it wrote, as an int."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover (child)
+        os.close(read_fd)
+        status = 1
+        try:
+            os.write(write_fd, str(child()).encode())
+            status = 0
+        finally:
+            os._exit(status)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        output = pipe.read()
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    return int(output)
+
+
+def test_sync_pool_after_fork(database):
+    with engine.connect() as conn:
+        parent = conn.execute(BACKEND_PID).scalar()
+
+    def child():
+        # a checked out connection has been pre-pinged: it must be a new one
+        pids = backend_pids(engine)
+        with engine.connect() as conn:
+            conn.execute(BACKEND_PID)
+        assert pids and parent not in pids, pids
+        return pids[-1]
+
+    assert run_in_child(child) != parent
+    with engine.connect() as conn:
+        assert conn.execute(BACKEND_PID).scalar() == parent
+
+
+def test_async_pool_after_fork(database):
+    loop = asyncio.new_event_loop()
+    try:
+        parent = loop.run_until_complete(async_backend_pid())
+
+        def child():
+            pids = backend_pids(async_engine.sync_engine)
+            pid = asyncio.new_event_loop().run_until_complete(async_backend_pid())
+            assert pids and parent not in pids, pids
+            return pid
+
+        assert run_in_child(child) != parent
+        assert loop.run_until_complete(async_backend_pid()) == parent
+    finally:
+        loop.run_until_complete(async_engine.dispose())
+        loop.close()
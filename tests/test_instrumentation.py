@@ -0,0 +1,34 @@
+"""Per-request statement counts and DB time from the engine hooks."""
+
+import os
+import time
+
+import pytest
+from sqlalchemy import exc, text
+
+if not os.getenv("TEST_DB_NAME"):
+    # app.database needs the DB_* settings at import
+    pytest.skip("TEST_DB_NAME is not set", allow_module_level=True)
+
+from app.instrumentation import RequestStats, _request_stats
+
+
+@pytest.fixture
+def stats():
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    yield stats
+    _request_stats.reset(token)
+
+
+def test_failed_statement_is_timed(database, stats):
+    with database.connect() as conn:
+        with pytest.raises(exc.DBAPIError):
+            conn.execute(text("SELECT pg_sleep(0.05), 1 / (random() * 0)::int"))
+        start = time.perf_counter()
+        conn.execute(text("SELECT 1"))
+        elapsed = time.perf_counter() - start
+        # nothing left behind on the pooled connection for later statements
+        assert not conn.info.get("query_start_time")
+    assert stats.statements == 2
+    assert 0.05 <= stats.db_time <= 0.05 + elapsed + 0.05
@@ -0,0 +1,71 @@
+"""Read routing (get_read_db) around the authentication dependencies."""
+
+import itertools
+import os
+
+import pytest
+
+if not os.getenv("TEST_DB_NAME"):
+    # app.database needs the DB_* settings at import
+    pytest.skip("TEST_DB_NAME is not set", allow_module_level=True)
+
+from app import auth, database, deps
+
+
+def decode_failures() -> float:
+    return auth.JWT_DECODE_FAILURES._values.get((), 0)
+
+
+@pytest.mark.parametrize("replicas", [False, True], ids=["primary", "replicas"])
+def test_bad_token_decoded_once(client, monkeypatch, replicas):
+    if replicas:
+        # routing decodes the token too; the primary stands in for a replica
+        monkeypatch.setattr(deps, "replica_engines", [database.async_engine])
+    before = decode_failures()
+    response = client.get("/tasks/my", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert decode_failures() - before == 1
+
+
+def test_register_reads_from_primary(client, monkeypatch):
+    monkeypatch.setattr(database, "replica_engines", [database.async_engine])
+    response = client.post(
+        "/auth/register",
+        json={"mobile": "200000001", "password": "pw", "role": "worker"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] in database.recent_writers
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Stand-in replica on the test database; yields the task queries it runs."""
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    engine = create_async_engine(database.async_engine.url, poolclass=NullPool)
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        if "FROM tasks" in statement:
+            statements.append(statement)
+
+    monkeypatch.setattr(deps, "replica_engines", [engine])
+    monkeypatch.setattr(database, "replica_engines", [engine])
+    monkeypatch.setattr(database, "_replica_cycle", itertools.repeat(engine))
+    # no read-your-writes window: a fresh user's reads go to the replica too
+    monkeypatch.setattr(database, "recent_writers", database.RecentWriters(0))
+    yield statements
+
+
+def test_changes_read_from_primary(client, register, replica):
+    headers, _ = register("200000002", "worker")
+    response = client.get("/tasks/my", headers=headers)
+    assert response.status_code == 200, response.text
+    assert replica  # listings do go to the replica
+    replica.clear()
+    response = client.get("/tasks/changes", headers=headers)
+    assert response.status_code == 200, response.text
+    assert replica == []
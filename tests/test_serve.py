@@ -0,0 +1,56 @@
+"""python -m app.serve applies the --db-budget pool sizes to the engines."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+if not os.getenv("TEST_DB_NAME"):
+    # app.database needs the DB_* settings at import
+    pytest.skip("TEST_DB_NAME is not set", allow_module_level=True)
+
+# Stands in for uvicorn.run: loads the app the way a single uvicorn worker
+# does, in this process, and reports the pools it got instead of serving.
+SERVE = """
+import json, sys
+import uvicorn
+
+def run(app, **kwargs):
+    kwargs.pop("workers")
+    uvicorn.Config(app, **kwargs).load()
+    from app.database import _sync_engines
+    print(json.dumps({
+        name: [sync_engine.pool.size(), sync_engine.pool._max_overflow]
+        for (name,), sync_engine in _sync_engines()
+    }))
+
+uvicorn.run = run
+from app.serve import main
+main(sys.argv[1:])
+"""
+
+
+def serve(*args):
+    env = dict(os.environ, DB_NAME=os.environ["TEST_DB_NAME"])
+    for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_CONNECTION_BUDGET"):
+        env.pop(name, None)
+    result = subprocess.run(
+        [sys.executable, "-c", SERVE, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_single_worker_budget():
+    pools = serve("--workers", "1", "--db-budget", "8")
+    assert pools == {"sync": [1, 3], "async": [1, 3]}
+
+
+def test_single_worker_defaults():
+    pools = serve("--workers", "1")
+    assert pools == {"sync": [10, 20], "async": [10, 20]}
@@ -0,0 +1,122 @@
+"""SQL issued per write endpoint: a fixed number of statements and one commit,
+whatever the size of a batch.
+
+Server defaults come back through RETURNING instead of a refresh SELECT, and
+callers are resolved from the user cache that login fills.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def users(register):
+    manager, _ = register("100000001", "manager")
+    worker, worker_id = register("100000002", "worker")
+    return manager, worker, worker_id
+
+
+def test_register(client, count_sql):
+    with count_sql() as sql:
+        response = client.post(
+            "/auth/register",
+            json={"mobile": "100000003", "password": "pw", "role": "worker"},
+        )
+    assert response.status_code == 200, response.text
+    # the duplicate lookup runs before hashing, then a single INSERT RETURNING
+    assert len(sql.statements) == 2, sql.statements
+    assert sql.statements[0].lstrip().startswith("SELECT")
+    assert sql.statements[1].lstrip().startswith("INSERT")
+    assert sql.commits == 1
+
+
+def test_register_duplicate_skips_insert(client, users, count_sql):
+    with count_sql() as sql:
+        response = client.post(
+            "/auth/register",
+            json={"mobile": "100000001", "password": "pw", "role": "worker"},
+        )
+    assert response.status_code == 400
+    assert sql.statements == []  # served from the user cache
+    assert sql.commits == 0
+
+
+def test_create_task(client, users, count_sql):
+    manager, _, worker_id = users
+    with count_sql() as sql:
+        response = client.post(
+            "/tasks/", json={"title": "t", "assigned_to": worker_id}, headers=manager
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "pending"
+    assert len(sql.statements) == 1, sql.statements
+    assert sql.statements[0].lstrip().startswith("INSERT")
+    assert sql.commits == 1
+
+
+def test_update_status(client, users, count_sql):
+    manager, worker, worker_id = users
+    task = client.post(
+        "/tasks/", json={"title": "t", "assigned_to": worker_id}, headers=manager
+    ).json()
+    with count_sql() as sql:
+        response = client.patch(
+            f"/tasks/{task['id']}/status", json={"status": "completed"}, headers=worker
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "completed"
+    assert len(sql.statements) == 1, sql.statements
+    assert sql.statements[0].lstrip().startswith("UPDATE")
+    assert sql.commits == 1
+
+
+@pytest.mark.parametrize("size", [1, 10, 100])
+def test_create_tasks_bulk(client, users, count_sql, size):
+    manager, _, worker_id = users
+    tasks = [{"title": f"t{i}", "assigned_to": worker_id} for i in range(size)]
+    with count_sql() as sql:
+        response = client.post("/tasks/bulk", json=tasks, headers=manager)
+    assert response.status_code == 200, response.text
+    assert len(response.json()["created"]) == size
+    # one worker lookup for the whole batch, then a multi-row INSERT RETURNING
+    assert len(sql.statements) == 2, sql.statements
+    assert sql.statements[0].lstrip().startswith("SELECT")
+    assert sql.statements[1].lstrip().startswith("INSERT")
+    assert sql.commits == 1
+
+
+@pytest.mark.parametrize("size", [1, 10, 100])
+def test_update_status_bulk(client, users, count_sql, size):
+    manager, worker, worker_id = users
+    tasks = [{"title": f"t{i}", "assigned_to": worker_id} for i in range(size)]
+    created = client.post("/tasks/bulk", json=tasks, headers=manager).json()
+    task_ids = [task["id"] for task in created["created"]]
+    with count_sql() as sql:
+        response = client.patch(
+            "/tasks/status",
+            json={"task_ids": task_ids, "status": "completed"},
+            headers=worker,
+        )
+    assert response.status_code == 200, response.text
+    assert all(result["ok"] for result in response.json()["results"])
+    assert len(sql.statements) == 1, sql.statements
+    assert sql.statements[0].lstrip().startswith("UPDATE")
+    assert sql.commits == 1
+
+
+@pytest.mark.parametrize("size", [1, 10, 100])
+def test_update_status_bulk_skipped(client, users, count_sql, size):
+    manager, worker, worker_id = users
+    # ids past every task: nothing is updated, one lookup explains them all
+    task_ids = [10**9 + i for i in range(size)]
+    with count_sql() as sql:
+        response = client.patch(
+            "/tasks/status",
+            json={"task_ids": task_ids, "status": "completed"},
+            headers=worker,
+        )
+    assert response.status_code == 200, response.text
+    assert {r["detail"] for r in response.json()["results"]} == {"Task not found"}
+    assert len(sql.statements) == 2, sql.statements
+    assert sql.statements[0].lstrip().startswith("UPDATE")
+    assert sql.statements[1].lstrip().startswith("SELECT")
+    assert sql.commits == 1
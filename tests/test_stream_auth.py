@@ -0,0 +1,43 @@
+"""Event streams take a short-lived ticket in the URL, never the access token."""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def worker(register):
+    return register("600000001", "worker")[0]
+
+
+@pytest.fixture
+def ticket(client, worker):
+    response = client.post("/tasks/events/ticket", headers=worker)
+    assert response.status_code == 200, response.text
+    return response.json()["ticket"]
+
+
+def access_token(headers) -> str:
+    return headers["Authorization"].removeprefix("Bearer ")
+
+
+def test_access_token_in_url_rejected(client, worker):
+    for param in ("token", "ticket"):
+        response = client.get("/tasks/events", params={param: access_token(worker)})
+        assert response.status_code == 401
+
+
+def test_ticket_is_not_an_access_token(client, ticket):
+    response = client.get("/tasks/my", headers={"Authorization": f"Bearer {ticket}"})
+    assert response.status_code == 401
+
+
+def test_websocket_with_ticket(client, ticket):
+    with client.websocket_connect(f"/tasks/ws?ticket={ticket}") as websocket:
+        websocket.close()
+
+
+def test_websocket_rejects_access_token_in_url(client, worker):
+    from starlette.websockets import WebSocketDisconnect
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/tasks/ws?ticket={access_token(worker)}"):
+            pass
@@ -0,0 +1,72 @@
+"""GET /tasks/changes never moves the watermark into the safety window."""
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture(scope="module")
+def manager(register):
+    return register("400000001", "manager")[0]
+
+
+def create_tasks(client, manager, worker_id, count, age=None):
+    """Create ``count`` tasks; ``age`` (e.g. '1 hour') backdates them."""
+    tasks = [{"title": f"t{i}", "assigned_to": worker_id} for i in range(count)]
+    response = client.post("/tasks/bulk", json=tasks, headers=manager)
+    ids = [task["id"] for task in response.json()["created"]]
+    if age is not None:
+        from app.database import engine
+
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE tasks SET created_at = now() - CAST(:age AS interval)"
+                    " WHERE id = ANY(:ids)"
+                ),
+                {"age": age, "ids": ids},
+            )
+    return ids
+
+
+def changes(client, worker, since=None, page_size=2):
+    params = {"page_size": page_size}
+    if since is not None:
+        params["since"] = since
+    response = client.get("/tasks/changes", params=params, headers=worker)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_page_into_window_ends_sync(client, register, manager):
+    worker, worker_id = register("400000002", "worker")
+    old = create_tasks(client, manager, worker_id, 3, age="1 hour")
+    recent = create_tasks(client, manager, worker_id, 3)
+
+    # old changes page on as usual
+    first = changes(client, worker)
+    assert [task["id"] for task in first["results"]] == old[:2]
+    assert first["has_more"] is True
+
+    # this page reaches into the window: the sync stops there
+    second = changes(client, worker, first["watermark"])
+    assert [task["id"] for task in second["results"]] == [old[2], recent[0]]
+    assert second["has_more"] is False
+
+    # a write committing late, stamped before the recent rows already sent
+    late = create_tasks(client, manager, worker_id, 1, age="1 second")
+
+    # the next sync resumes behind the window and sends all of it again
+    third = changes(client, worker, second["watermark"], page_size=10)
+    assert [task["id"] for task in third["results"]] == late + recent
+    assert third["has_more"] is False
+
+
+def test_window_larger_than_page(client, register, manager):
+    worker, worker_id = register("400000003", "worker")
+    create_tasks(client, manager, worker_id, 5)
+    first = changes(client, worker, page_size=2)
+    # no way to page past the window without moving into it: stop, don't loop
+    assert first["has_more"] is False
+    again = changes(client, worker, first["watermark"], page_size=2)
+    assert again["results"] == first["results"]
+    assert again["has_more"] is False
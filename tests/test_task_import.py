@@ -0,0 +1,44 @@
+"""POST /tasks/import rejects bad rows one by one instead of failing the file."""
+
+import json
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def users(register):
+    manager, _ = register("300000001", "manager")
+    _, worker_id = register("300000002", "worker")
+    return manager, worker_id
+
+
+def upload(client, manager, filename, body):
+    return client.post(
+        "/tasks/import", files={"file": (filename, body)}, headers=manager
+    )
+
+
+def test_ndjson_assigned_to_must_be_an_id(client, users):
+    manager, worker_id = users
+    values = [worker_id, str(worker_id), 3.9, True, 2**31, -1, "1e3", None]
+    body = "".join(
+        json.dumps({"title": f"t{i}", "assigned_to": value}) + "\n"
+        for i, value in enumerate(values)
+    )
+    response = upload(client, manager, "tasks.ndjson", body)
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["imported"] == 2
+    assert summary["errors"] == [
+        {"line": line, "detail": "Invalid assigned_to"} for line in range(3, 9)
+    ]
+
+
+def test_csv_out_of_range_assigned_to(client, users):
+    manager, worker_id = users
+    body = f"title,assigned_to\na,{worker_id}\nb,99999999999\nc,１\n"
+    response = upload(client, manager, "tasks.csv", body)
+    assert response.status_code == 200, response.text
+    summary = response.json()
+    assert summary["imported"] == 1
+    assert [error["line"] for error in summary["errors"]] == [3, 4]